@@ -54,6 +54,19 @@ def _retry_stale(fn, tries=3, pause=0.12):
     return None
 
 
+# True while UI5 is initializing, re-rendering or showing the global busy indicator.
+_BUSY_JS = """
+try{
+  var core=sap && sap.ui && sap.ui.getCore ? sap.ui.getCore():null;
+  if(core && core.isInitialized && !core.isInitialized()) return true;
+  if(core && core.getUIDirty && core.getUIDirty()) return true;
+  var BI=sap && sap.ui && sap.ui.core && sap.ui.core.BusyIndicator;
+  if(BI && BI.oPopup && BI.oPopup.getOpenState && BI.oPopup.getOpenState() === 'OPEN'){return true;}
+  return false;
+}catch(e){return false;}
+"""
+
+
 class CurrencyExchangeRatesPage(Page):
     def __init__(self, driver, root: Optional[str] = None):
         super().__init__(driver, root)
@@ -77,18 +90,7 @@ class CurrencyExchangeRatesPage(Page):
         end = time.time() + max(1, timeout)
         while time.time() < end:
             try:
-                busy = self.driver.execute_script(
-                    """
-                    try{
-                      var core=sap && sap.ui && sap.ui.getCore ? sap.ui.getCore():null;
-                      if(core && core.isInitialized && !core.isInitialized()) return true;
-                      if(core && core.getUIDirty && core.getUIDirty()) return true;
-                      var BI=sap && sap.ui && sap.ui.core && sap.ui.core.BusyIndicator;
-                      if(BI && BI.oPopup && BI.oPopup.getOpenState && BI.oPopup.getOpenState() === 'OPEN'){return true;}
-                      return false;
-                    }catch(e){return false;}
-                    """
-                )
+                busy = self.driver.execute_script(_BUSY_JS)
                 if not busy:
                     return True
             except Exception:
@@ -96,6 +98,23 @@ class CurrencyExchangeRatesPage(Page):
             time.sleep(0.12)
         return False
 
+    def wait_ready(self, timeout: float = 0.2, poll: float = 0.02) -> bool:
+        """
+        Short settle after an item: returns as soon as UI5 reports not busy,
+        otherwise after `timeout` seconds at most.
+        """
+        end = time.monotonic() + max(0.0, timeout)
+        while True:
+            try:
+                if not self.driver.execute_script(_BUSY_JS):
+                    return True
+            except Exception:
+                return True
+            left = end - time.monotonic()
+            if left <= 0:
+                return False
+            time.sleep(min(poll, left))
+
     # --- EXACTLY set Exchange Rate Type to the full label ---
     def _set_exchange_rate_type_exact(self, fields: Fields, timeout: int = 12) -> dict:
         """
@@ -1,7 +1,10 @@
 # routes/currency.py
 from __future__ import annotations
 
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 import time
 import uuid
 from datetime import datetime
@@ -14,16 +17,38 @@ from fastapi import APIRouter, BackgroundTasks, HTTPException, Response
 from services.config import config
 from services.schemas import ExchangeRateItem
 from services.runner import BatchRunner
-from services.reporting import ensure_reports_dir, write_json, write_failed_csv
+from services.reporting import ensure_reports_dir, write_json
 from services.daily import finalize_batch_tracking, prune_live_trackers, daily_rollup_collect
 from services.tracking import read_live_status_summary
 
+class _DeferredQueueHandler(QueueHandler):
+    """
+    In-process queue: merge the %-args into the message now, so mutable args are logged as
+    they were at call time; the listener thread applies the formatter and renders exc_info.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
 log = logging.getLogger("sapbot")
 if not log.handlers:
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s [%(levelname)s] %(threadName)s %(message)s"
     )
+    # Workers only enqueue; one listener thread formats and writes to stderr.
+    _console = logging.StreamHandler()
+    _console.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(threadName)s %(message)s"))
+    _log_q: queue.Queue = queue.Queue(-1)
+    _listener = QueueListener(_log_q, _console, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    log.addHandler(_DeferredQueueHandler(_log_q))
+    log.setLevel(logging.INFO)
+    log.propagate = False
 
 router = APIRouter()
 
@@ -93,18 +118,7 @@ def _run_batch_background(
         result = runner.run_force_all_done(items)
         duration_sec = time.time() - start_ts
 
-        # Persist standard artifacts for synchronous compatibility
-        result_path = Path(runner.batch_dir) / "result.json"
-        failed_json_path = Path(runner.batch_dir) / "failed.json"
-        failed_csv_path = Path(runner.batch_dir) / "failed.csv"
-
-        failed_rows = [r for r in result.get("results", [])
-                       if (r.get("status") or "").strip().lower() not in ("created", "skipped")]
-        write_json(result_path, result)
-        write_json(failed_json_path, failed_rows)
-        write_failed_csv(failed_csv_path, failed_rows)
-
-        # Persist/email/relocate via runner helper
+        # Persist artifacts (result/failed/skipped), email & relocate via runner helper
         result_out = runner.persist_and_email(result, duration_sec)
 
         # Move trackers to finished/<day>/<batch_id>, prune live, and (optionally) daily rollup
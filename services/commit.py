@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import threading
+import zlib
 from contextlib import contextmanager
 from typing import Any, Iterable
 
@@ -13,6 +14,25 @@ _GLOBAL_SEM = threading.Semaphore(_COMMIT_CONCURRENCY)
 _KEY_LOCKS: dict[str, tuple[threading.Lock, int]] = {}
 _KEY_LOCKS_GUARD = threading.Lock()
 
+# Process mode (WORKER_PROCESSES): the gate must span processes, so the parent creates a
+# multiprocessing semaphore plus a fixed set of key-striped locks (make_shared_gate) and
+# each child installs them (use_shared_gate). Unrelated keys may share a stripe; that only
+# serializes them, never lets conflicting commits overlap.
+_KEY_STRIPES: list | None = None
+_SHARED_STRIPES = 64
+
+
+def make_shared_gate(ctx, stripes: int = _SHARED_STRIPES) -> tuple:
+    """(global semaphore, key stripe locks) from a multiprocessing context, for use_shared_gate."""
+    return ctx.BoundedSemaphore(_COMMIT_CONCURRENCY), [ctx.Lock() for _ in range(max(1, stripes))]
+
+
+def use_shared_gate(shared: tuple) -> None:
+    """Route commit_gate in this process through the parent's make_shared_gate primitives."""
+    global _GLOBAL_SEM, _KEY_STRIPES
+    _GLOBAL_SEM, stripes = shared
+    _KEY_STRIPES = list(stripes)
+
 
 def _normalize_key(key: Any) -> str | None:
     """Turn various key shapes into a stable, case-insensitive token."""
@@ -72,8 +92,14 @@ def commit_gate(key: Any = None):
     normalized_key = _normalize_key(key)
     key_lock: threading.Lock | None = None
 
+    stripe = None
+
     try:
-        if normalized_key:
+        if normalized_key and _KEY_STRIPES is not None:
+            # crc32, not hash(): str hashes are salted per process
+            stripe = _KEY_STRIPES[zlib.crc32(normalized_key.encode("utf-8")) % len(_KEY_STRIPES)]
+            stripe.acquire()
+        elif normalized_key:
             key_lock = _reserve_key_lock(normalized_key)
             key_lock.acquire()
 
@@ -83,6 +109,8 @@ def commit_gate(key: Any = None):
         finally:
             _GLOBAL_SEM.release()
     finally:
+        if stripe is not None:
+            stripe.release()
         if normalized_key and key_lock:
             key_lock.release()
             _release_key_lock(normalized_key, key_lock)
\ No newline at end of file
@@ -34,7 +34,14 @@ def config():
         # Multithreading / pacing
         "NUM_WORKERS": _as_int(os.getenv("NUM_WORKERS", "4"), 4),
         "LOGIN_CONCURRENCY": _as_int(os.getenv("LOGIN_CONCURRENCY", "2"), 2),
+        "LOGIN_TOKEN_REUSE": _as_bool(os.getenv("LOGIN_TOKEN_REUSE", "false")),  # recreated drivers reuse recent login cookies
+        "LOGIN_TOKEN_TTL_SEC": _as_int(os.getenv("LOGIN_TOKEN_TTL_SEC", "900"), 900),
+        "RECOVER_BUDGET_SEC": _as_int(os.getenv("RECOVER_BUDGET_SEC", "120"), 120),  # cap on one app-reopen retry loop
         "WATCHDOG_SECONDS": _as_int(os.getenv("WATCHDOG_SECONDS", "2000"), 2000),
+        "WORK_QUEUE_BATCH": _as_int(os.getenv("WORK_QUEUE_BATCH", "4"), 4),  # rows a worker takes from the shared queue at once
+        "DRIVER_POOL_MIN_IDLE": _as_int(os.getenv("DRIVER_POOL_MIN_IDLE", "0"), 0),  # pre-warmed logged-in drivers for recovery (0 = off)
+        "WORKER_PROCESSES": _as_bool(os.getenv("WORKER_PROCESSES", "false")),  # one process per worker instead of threads
+        "WORKER_CPU_AFFINITY": _as_bool(os.getenv("WORKER_CPU_AFFINITY", "false")),  # pin each worker thread to one CPU
         "CHROME_USER_DATA_BASE": os.getenv("CHROME_USER_DATA_BASE", "chrome_profile"),
 
         # Reporting
@@ -58,6 +65,8 @@ def config():
 
         # Tracking
         "TRACK_DIR": os.getenv("TRACK_DIR", "WebService/TrackDrivers"),
+        "TRACK_FLUSH_EVERY": _as_int(os.getenv("TRACK_FLUSH_EVERY", "16"), 16),  # status updates per log write
+        "TRACK_FLUSH_MS": _as_int(os.getenv("TRACK_FLUSH_MS", "2000"), 2000),  # max age of a buffered update
 
         # Force-all-done loop
         "FORCE_ALL_DONE_ENABLED": _as_bool(os.getenv("FORCE_ALL_DONE_ENABLED", "true")),
@@ -56,6 +56,9 @@ IN_DOCKER = _is_docker()
 # Paths / timeouts
 CHROMEDRIVER_PATH_ENV = os.getenv("CHROMEDRIVER_PATH", "/usr/local/bin/chromedriver")
 PAGELOAD_TIMEOUT_DEFAULT = int(os.getenv("PAGELOAD_TIMEOUT_SECONDS", "90") or "90")
+# Per-host sockets kept by each driver's HTTP client (Selenium's default is 1, so a watchdog
+# quit() racing an in-flight command logs "connection pool is full" and dials a throwaway socket)
+DRIVER_HTTP_POOL_MAXSIZE = int(os.getenv("DRIVER_HTTP_POOL_MAXSIZE", "4") or "4")
 
 # Profile base dirs (overrideable)
 LINUX_PROFILE_BASE_DEFAULT = "/home/appuser/chrome-profiles"
@@ -242,6 +245,7 @@ def _start_with(service: Service, options: Options, user_data_dir: Optional[str]
     )
 
     drv = webdriver.Chrome(service=service, options=options)
+    _widen_command_pool(drv)
     drv.set_page_load_timeout(timeout_s)
 
     # CDP: allow downloads explicitly (helps with some blob-based flows)
@@ -263,6 +267,26 @@ def _start_with(service: Service, options: Options, user_data_dir: Optional[str]
         pass
     return drv
 
+def _widen_command_pool(drv) -> None:
+    """
+    Best-effort: rebuild the command executor's urllib3 PoolManager with the same settings
+    but maxsize=DRIVER_HTTP_POOL_MAXSIZE. Proxy managers and unknown layouts are left alone.
+    """
+    try:
+        import urllib3
+        ex = drv.command_executor
+        old = getattr(ex, "_conn", None)
+        if not isinstance(old, urllib3.PoolManager) or isinstance(old, urllib3.ProxyManager):
+            return
+        kw = dict(old.connection_pool_kw)
+        if kw.get("maxsize", 1) >= DRIVER_HTTP_POOL_MAXSIZE:
+            return
+        kw["maxsize"] = DRIVER_HTTP_POOL_MAXSIZE
+        ex._conn = urllib3.PoolManager(**kw)
+        old.clear()
+    except Exception as e:
+        log.debug("HTTP pool resize skipped: %s", e)
+
 def ensure_driver_binary_ready() -> str:
     """
     Kept for backward compatibility. On Windows, you likely rely on Selenium Manager;
@@ -83,6 +83,23 @@ def write_skipped_csv(path: Path, skipped_rows: List[Dict[str, Any]]) -> None:
                 "round": r.get("round"),
             })
 
+def write_batch_artifacts(
+    batch_dir: Path,
+    result: Dict[str, Any],
+    failed_rows: List[Dict[str, Any]],
+    skipped_rows: List[Dict[str, Any]],
+) -> None:
+    """
+    Persist result.json + failed/skipped JSON/CSV for a batch in one pass.
+    Callers pass the already-classified rows so nothing is re-filtered here.
+    """
+    ensure_reports_dir(batch_dir)
+    write_json(batch_dir / "result.json", result)
+    write_json(batch_dir / "failed.json", failed_rows)
+    write_failed_csv(batch_dir / "failed.csv", failed_rows)
+    write_json(batch_dir / "skipped.json", skipped_rows)
+    write_skipped_csv(batch_dir / "skipped.csv", skipped_rows)
+
 # ---------- daily rollup (by records' day) ----------
 
 def _daily_dir(day: str | None = None) -> Path:
@@ -2,29 +2,42 @@
 from __future__ import annotations
 
 import logging
+import multiprocessing
+from logging.handlers import QueueListener
+import queue
 import random
 import shutil
 import time
 import threading
 from pathlib import Path
 from typing import Any, Dict, List, Tuple, Iterable
-from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-from services.schemas import ExchangeRateItem
+from services.schemas import ExchangeRateItem, norm_status
 from services.driver import ensure_driver_binary_ready, cleanup_profiles
+from services.commit import make_shared_gate
 from services.tracking import (
     tracking_dir_for_batch,
     tracking_path_for_worker,
     init_tracking_files,
     pending_rows_for_report,
+    count_pending,
+    forget_track_dir,
+)
+from services.worker import (
+    worker_process,
+    process_worker_main,
+    chunk_evenly,
+    build_work_queue,
+    close_writers,
+    DriverPool,
+    LoginSlots,
 )
-from services.worker import worker_process, chunk_evenly
 from services.reporting import (
     ensure_reports_dir,
     write_json,
-    write_failed_csv,
-    write_skipped_csv,
+    write_batch_artifacts,
     append_daily_rollup,
     move_tracker_if_finished,
     prune_live_trackers,
@@ -33,6 +46,13 @@ from services.reporting import (
 log = logging.getLogger("sapbot")
 
 
+class _ToSapbotLog(logging.Handler):
+    """Replays records from worker processes into this process's sapbot handlers."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        log.handle(record)
+
+
 class BatchRunner:
     def __init__(self, cfg: Dict[str, Any], batch_id: str, reports_root: Path, workers: int):
         self.cfg = cfg
@@ -41,6 +61,17 @@ class BatchRunner:
         self.reports_root = ensure_reports_dir(reports_root)
         self.batch_dir = ensure_reports_dir(self.reports_root / batch_id)
         self.track_dir = tracking_dir_for_batch(cfg, batch_id)
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        """
+        Stop the batch. Thread-mode workers finish the row in hand and leave the rest
+        Pending, queued logins give up, the between-round backoff is cut short and no
+        further round starts. WORKER_PROCESSES rounds only stop at the round boundary.
+        stream_events calls this when its consumer disconnects; run_force_all_done runs
+        from background tasks that have no client to lose, so there it is a caller's hook.
+        """
+        self._cancel_event.set()
 
     # ---------- helpers: records' day (from ValidFrom) + relocate ----------
 
@@ -90,44 +121,200 @@ class BatchRunner:
 
     # ---------- internal helpers ----------
 
+    @staticmethod
+    def _no_result_row(idx: int, item: ExchangeRateItem, round_no: int) -> Dict[str, Any]:
+        return {
+            "index": idx,
+            "payload": item.dict(),
+            "status": "error",
+            "error": "no_result",
+            "round": round_no,
+        }
+
+    @staticmethod
+    def _classify(rows: List[Dict[str, Any]]) -> Tuple[int, List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """One pass over final rows → (created count, failed rows, skipped rows)."""
+        created = 0
+        failed_rows: List[Dict[str, Any]] = []
+        skipped_rows: List[Dict[str, Any]] = []
+        for r in rows:
+            st = norm_status(r.get("status"))
+            if st == "created":
+                created += 1
+            elif st == "skipped":
+                skipped_rows.append(r)
+            else:
+                failed_rows.append(r)
+        return created, failed_rows, skipped_rows
+
+    @staticmethod
+    def _round_backoff(base_sleep: int, n_pending: int, round_no: int, max_rounds: int) -> float:
+        """
+        Pause before the next force-all-done round, scaled by how many rows are still Pending.
+        No pause after the first round, when nothing is pending, or when no round is left.
+        """
+        if base_sleep <= 0 or n_pending <= 0 or round_no <= 1:
+            return 0.0
+        if max_rounds > 0 and round_no >= max_rounds:
+            return 0.0
+        return min(base_sleep, 1.0 + 0.5 * n_pending) + random.uniform(0, 1.0)
+
+    def _process_worker_results(self, track_paths: List[Path], poll_sec: float) -> Iterable[Dict[str, Any] | None]:
+        """
+        WORKER_PROCESSES mode: run the round in spawned processes, each owning whole
+        tracker shards (writers are per process, so no file has two writers). Yields each
+        worker's result as it arrives, and None whenever `poll_sec` passes without one.
+        A process that dies without reporting yields a worker_crashed row.
+        """
+        paths = [p for p in track_paths if count_pending(p)]
+        n = min(self.workers, len(paths))
+        if not n:
+            return
+
+        ctx = multiprocessing.get_context("spawn")
+        stop_event = ctx.Event()
+        login_sem = ctx.BoundedSemaphore(int(self.cfg.get("LOGIN_CONCURRENCY", min(2, self.workers))))
+        result_q = ctx.Queue()
+        commit_shared = make_shared_gate(ctx)
+        log_q = ctx.Queue()
+        log_listener = QueueListener(log_q, _ToSapbotLog())
+        log_listener.start()
+        procs = []
+        for w_id, (a, b) in enumerate(chunk_evenly(len(paths), n), start=1):
+            proc = ctx.Process(
+                target=process_worker_main,
+                args=(paths[a:b], stop_event, login_sem, self.cfg, w_id, result_q, commit_shared, log_q),
+                name=f"sapbot-worker-{w_id}",
+            )
+            proc.start()
+            procs.append(proc)
+
+        waiting = {w_id: proc for w_id, proc in enumerate(procs, start=1)}
+        try:
+            while waiting:
+                try:
+                    w_id, r = result_q.get(timeout=poll_sec)
+                except queue.Empty:
+                    for w_id in [w for w, proc in waiting.items() if not proc.is_alive()]:
+                        if w_id not in waiting:
+                            continue
+                        # a result put just before exit may still be in the pipe
+                        try:
+                            got_id, r = result_q.get(timeout=0.5)
+                        except queue.Empty:
+                            proc = waiting.pop(w_id)
+                            yield {"results": [{
+                                "index": None,
+                                "status": "error",
+                                "error": f"worker_crashed: exitcode={proc.exitcode}",
+                            }]}
+                            continue
+                        waiting.pop(got_id, None)
+                        yield r
+                    if waiting:
+                        yield None
+                    continue
+                waiting.pop(w_id, None)
+                yield r
+        finally:
+            for proc in procs:
+                proc.join(timeout=5)
+                if proc.is_alive():
+                    proc.terminate()
+            log_listener.stop()
+
+    def _start_driver_pool(self, login_sem) -> DriverPool | None:
+        """Round-scoped pool of pre-warmed drivers (thread mode), or None when disabled."""
+        min_idle = int(self.cfg.get("DRIVER_POOL_MIN_IDLE", 0))
+        return DriverPool(self.cfg, login_sem, min_idle).start() if min_idle > 0 else None
+
+    def _thread_worker_rows(self, work_q, n_workers: int, login_sem, driver_pool, poll_sec: float) -> Iterable[Dict[str, Any] | None]:
+        """
+        Run the round on a thread pool. Workers put each result row on a shared queue;
+        yield rows as they arrive, and None whenever `poll_sec` passes without one.
+        A worker that raised yields a worker_crashed row once all workers are done.
+        """
+        stop_event = threading.Event()
+        result_q: queue.Queue = queue.Queue()
+        with ThreadPoolExecutor(max_workers=n_workers) as pool:
+            futures = [
+                pool.submit(worker_process, work_q, stop_event, login_sem, self.cfg, w_id, driver_pool, result_q,
+                            self._cancel_event)
+                for w_id in range(1, n_workers + 1)
+            ]
+            last_emit = time.monotonic()
+            try:
+                while True:
+                    try:
+                        row = result_q.get(timeout=min(poll_sec, 0.5))
+                    except queue.Empty:
+                        # a finished worker has put all its rows, so an empty queue now means done
+                        if all(f.done() for f in futures) and result_q.empty():
+                            break
+                        if time.monotonic() - last_emit >= poll_sec:
+                            yield None
+                            last_emit = time.monotonic()
+                        continue
+                    yield row
+                    last_emit = time.monotonic()
+            except GeneratorExit:
+                # consumer went away: stop the workers *before* the executor waits for them
+                self._cancel_event.set()
+                raise
+
+            for fut in futures:
+                try:
+                    fut.result()
+                except Exception as e:
+                    yield {
+                        "index": None,
+                        "status": "error",
+                        "error": f"worker_crashed: {type(e).__name__}: {e}",
+                    }
+
     def _run_multithread_once(self, items: List[ExchangeRateItem]) -> Dict[str, Any]:
         try:
             ensure_driver_binary_ready()
         except Exception:
             pass
 
-        indexed = list(enumerate(items, start=1))
-        shards = chunk_evenly(indexed, self.workers)
-        stop_event = threading.Event()
-        login_sem = threading.BoundedSemaphore(int(self.cfg.get("LOGIN_CONCURRENCY", min(2, self.workers))))
+        bounds = chunk_evenly(len(items), self.workers)
+        login_sem = LoginSlots(int(self.cfg.get("LOGIN_CONCURRENCY", min(2, self.workers))), cancel=self._cancel_event)
 
-        init_tracking_files(self.track_dir, shards)
+        init_tracking_files(self.track_dir, items, bounds)
 
         track_files = {w_id: tracking_path_for_worker(self.track_dir, w_id)
-                       for w_id, _ in enumerate(shards, start=1)}
+                       for w_id in range(1, len(bounds) + 1)}
 
         all_results: List[Dict[str, Any]] = []
-        with ThreadPoolExecutor(max_workers=self.workers) as pool:
-            futures = []
-            for w_id, shard in enumerate(shards, start=1):
-                track_file = track_files[w_id]
-                futures.append(pool.submit(
-                    worker_process, shard, stop_event, login_sem, self.cfg, w_id, track_file
-                ))
-
-            for fut in as_completed(futures):
-                try:
-                    r = fut.result()
-                except Exception as e:
-                    r = {"results": [{
-                        "index": None,
-                        "status": "error",
-                        "error": f"worker_crashed: {type(e).__name__}: {e}",
-                    }]}
-                all_results.extend(r.get("results", []))
+        if self.cfg.get("WORKER_PROCESSES"):
+            for r in self._process_worker_results(list(track_files.values()), poll_sec=5):
+                if r is not None:
+                    all_results.extend(r.get("results", []))
+            return self._collect_round(all_results, track_files.values())
+
+        # one shared queue of Pending rows; no more workers than rows
+        work_q, writers = build_work_queue(track_files.values(), self.cfg)
+        n_workers = min(self.workers, len(work_q))
+        driver_pool = self._start_driver_pool(login_sem) if n_workers else None
+
+        try:
+            if n_workers:
+                for row in self._thread_worker_rows(work_q, n_workers, login_sem, driver_pool, poll_sec=5):
+                    if row is not None:
+                        all_results.append(row)
+        finally:
+            close_writers(writers)
+            if driver_pool is not None:
+                driver_pool.close()
 
+        return self._collect_round(all_results, track_files.values())
+
+    @staticmethod
+    def _collect_round(all_results: List[Dict[str, Any]], track_files: Iterable[Path]) -> Dict[str, Any]:
+        """Add tracker-Pending rows no worker reported, then sort by index."""
         have_idx = {r.get("index") for r in all_results if r.get("index") is not None}
-        for tf in track_files.values():
+        for tf in track_files:
             try:
                 for prow in pending_rows_for_report(tf):
                     idx = prow.get("index")
@@ -152,7 +339,7 @@ class BatchRunner:
         max_rounds = int(self.cfg.get("FORCE_ALL_DONE_MAX_ROUNDS", 25))
         max_minutes = int(self.cfg.get("FORCE_ALL_DONE_MAX_MINUTES", 60))
 
-        start_ts = time.time()
+        start_ts = time.monotonic()
         time_cap = (max_minutes > 0)
 
         aggregate_results: Dict[int, Dict[str, Any]] = {}
@@ -161,9 +348,11 @@ class BatchRunner:
 
         try:
             while pending:
+                if self._cancel_event.is_set():
+                    break
                 if max_rounds > 0 and round_no >= max_rounds:
                     break
-                if time_cap and (time.time() - start_ts) > (max_minutes * 60):
+                if time_cap and (time.monotonic() - start_ts) > (max_minutes * 60):
                     break
 
                 round_no += 1
@@ -181,31 +370,25 @@ class BatchRunner:
                 for i in range(lim):
                     orig_idx, orig_item = pending[i]
                     row = aggregate_results.get(orig_idx, {})
-                    st = (row.get("status") or "").strip().lower()
-                    if st == "pending":
+                    if norm_status(row.get("status")) == "pending":
                         next_pending.append((orig_idx, orig_item))
 
                 if next_pending:
-                    time.sleep(base_sleep + random.uniform(0, 2.0))
+                    pause = self._round_backoff(base_sleep, len(next_pending), round_no, max_rounds)
                     pending = next_pending
+                    if pause > 0 and self._cancel_event.wait(pause):
+                        break
                 else:
                     pending = []
 
-            for idx in range(1, len(items) + 1):
-                aggregate_results.setdefault(idx, {
-                    "index": idx,
-                    "payload": items[idx - 1].dict(),
-                    "status": "error",
-                    "error": "no_result",
-                    "round": round_no,
-                })
-
-            final_rows = [aggregate_results[i] for i in sorted(aggregate_results.keys())]
-            created = sum(1 for r in final_rows if (r.get("status") or "").lower() == "created")
-            failed_rows = [r for r in final_rows if (r.get("status") or "").lower() not in ("created", "skipped")]
+            # indexes are dense 1..N: assemble in order, filling gaps with no_result rows
+            final_rows = [
+                aggregate_results.get(idx) or self._no_result_row(idx, items[idx - 1], round_no)
+                for idx in range(1, len(items) + 1)
+            ]
+            created, failed_rows, skipped_rows = self._classify(final_rows)
             failed = len(failed_rows)
-            skipped = sum(1 for r in final_rows if (r.get("status") or "").lower() == "skipped")
-            skipped_rows = [r for r in final_rows if (r.get("status") or "").lower() == "skipped"]
+            skipped = len(skipped_rows)
 
             return {
                 "ok": failed == 0,
@@ -220,17 +403,20 @@ class BatchRunner:
                 "force_all_done_max_rounds": max_rounds,
                 "force_all_done_time_cap_minutes": max_minutes,
                 "track_dir": str(self.track_dir),
+                # internal: reused by persist_and_email, popped before anything is serialized
+                "_failed_rows": failed_rows,
             }
         finally:
             try:
                 if self.track_dir.exists():
                     shutil.rmtree(self.track_dir, ignore_errors=True)
+                forget_track_dir(self.track_dir)
             except Exception:
                 pass
 
     # ---------------- PUBLIC: streaming ----------------
     def stream_events(self, items: List[ExchangeRateItem], heartbeat_sec: int = 5) -> Iterable[str]:
-        start_ts = time.time()
+        start_ts = time.monotonic()
         workers = self.workers
         base_sleep = max(0, int(self.cfg.get("FORCE_ALL_DONE_BASE_SLEEP_SEC", 8)))
         max_rounds = int(self.cfg.get("FORCE_ALL_DONE_MAX_ROUNDS", 25))
@@ -252,60 +438,67 @@ class BatchRunner:
 
         try:
             while pending_pairs:
+                if self._cancel_event.is_set():
+                    break
                 if max_rounds > 0 and round_no >= max_rounds:
                     break
-                if time_cap and (time.time() - start_ts) > (max_minutes * 60):
+                if time_cap and (time.monotonic() - start_ts) > (max_minutes * 60):
                     break
 
                 round_no += 1
-                shards = chunk_evenly(pending_pairs, workers)
-
-                init_tracking_files(self.track_dir, shards)
-
-                stop_event = threading.Event()
-                login_sem = threading.BoundedSemaphore(int(self.cfg.get("LOGIN_CONCURRENCY", min(2, workers))))
-
-                with ThreadPoolExecutor(max_workers=workers) as pool:
-                    futures = [
-                        pool.submit(
-                            worker_process, shard, stop_event, login_sem, self.cfg, w_id,
-                            tracking_path_for_worker(self.track_dir, w_id)
-                        )
-                        for w_id, shard in enumerate(shards, start=1)
-                    ]
-
-                    pending_futs = set(futures)
-                    last_emit = time.time()
-
-                    while pending_futs: 
-                        done, pending_futs = wait(pending_futs, timeout=heartbeat_sec, return_when=FIRST_COMPLETED)
-                        
-                        for fut in done:
-                            try: 
-                                r = fut.result()
-                            except Exception as e:
-                                r = {"results": [ {"index": None, "status": "error", "error": f"worker_crashed: {type(e).__name__}: {e}", "round": round_no} ]}
-                        
-                            rows = r.get("results", []) 
-                            for row in rows: 
-                                row["round"] = round_no
-                            all_rows_this_batch.extend(rows) 
-                            
-                            for row in rows:
-                                yield self._json_line({"event": "row", **row})
-                            last_emit = time.time()
-                            
-                        if (time.time() - last_emit) >= heartbeat_sec:
+                # trackers persist across rounds; workers only pick rows still Pending
+                bounds = chunk_evenly(len(items), workers)
+
+                init_tracking_files(self.track_dir, items, bounds)
+                track_paths = [tracking_path_for_worker(self.track_dir, w_id) for w_id in range(1, len(bounds) + 1)]
+
+                def _rows_of(rows: List[Dict[str, Any]]) -> Iterable[str]:
+                    for row in rows:
+                        row["round"] = round_no
+                        if row.get("index") is not None:
+                            aggregate[row["index"]] = row
+                    all_rows_this_batch.extend(rows)
+                    for row in rows:
+                        yield self._json_line({"event": "row", **row})
+
+                if self.cfg.get("WORKER_PROCESSES"):
+                    if not any(count_pending(p) for p in track_paths):
+                        break  # every row already settled
+                    for r in self._process_worker_results(track_paths, poll_sec=heartbeat_sec):
+                        if r is None:
                             yield self._json_line({"event": "tick", "ts": self._iso_now()})
-                            last_emit = time.time()
+                        else:
+                            yield from _rows_of(r.get("results", []))
+                    continue
 
-            results_sorted = sorted(list(aggregate.values()), key=lambda x: (x.get("index") or 0))
-            created = sum(1 for r in results_sorted if (r.get("status") or "").lower() == "created")
-            failed_rows = [r for r in results_sorted if (r.get("status") or "").lower() not in ("created", "skipped")]
+                work_q, writers = build_work_queue(track_paths, self.cfg)
+                n_workers = min(workers, len(work_q))
+                if not n_workers:
+                    close_writers(writers)
+                    break  # every row already settled
+
+                login_sem = LoginSlots(int(self.cfg.get("LOGIN_CONCURRENCY", min(2, workers))), cancel=self._cancel_event)
+                driver_pool = self._start_driver_pool(login_sem)
+
+                try:
+                    for row in self._thread_worker_rows(work_q, n_workers, login_sem, driver_pool, poll_sec=heartbeat_sec):
+                        if row is None:
+                            yield self._json_line({"event": "tick", "ts": self._iso_now()})
+                        else:
+                            yield from _rows_of([row])
+                finally:
+                    close_writers(writers)
+                    if driver_pool is not None:
+                        driver_pool.close()
+
+            results_sorted = [
+                aggregate.get(idx) or self._no_result_row(idx, items[idx - 1], round_no)
+                for idx in range(1, len(items) + 1)
+            ]
+            created, failed_rows, skipped_rows = self._classify(results_sorted)
             failed = len(failed_rows)
-            skipped = sum(1 for r in results_sorted if (r.get("status") or "").lower() == "skipped")
-            skipped_rows = [r for r in results_sorted if (r.get("status") or "").lower() == "skipped"]
-            duration_sec = time.time() - start_ts
+            skipped = len(skipped_rows)
+            duration_sec = time.monotonic() - start_ts
 
             result = {
                 "ok": (failed == 0),
@@ -322,17 +515,7 @@ class BatchRunner:
             }
 
             # persist per-batch artifacts
-            result_path = self.batch_dir / "result.json"
-            failed_json_path = self.batch_dir / "failed.json"
-            failed_csv_path = self.batch_dir / "failed.csv"
-            skipped_json_path = self.batch_dir / "skipped.json"
-            skipped_csv_path = self.batch_dir / "skipped.csv"
-
-            write_json(result_path, result)
-            write_json(failed_json_path, failed_rows)
-            write_failed_csv(failed_csv_path, failed_rows)
-            write_json(skipped_json_path, skipped_rows)
-            write_skipped_csv(skipped_csv_path, skipped_rows)
+            write_batch_artifacts(self.batch_dir, result, failed_rows, skipped_rows)
 
             # figure records' day from the batch items and MOVE under reports/<day>/<batch_id>
             rec_day = self._record_day_from_items(items)
@@ -378,10 +561,15 @@ class BatchRunner:
                 "records_day": rec_day,
             })
 
+        except GeneratorExit:
+            # consumer went away (client disconnected): stop scheduling rounds
+            self.cancel()
+            raise
         finally:
             try:
                 if self.track_dir.exists():
                     shutil.rmtree(self.track_dir, ignore_errors=True)
+                forget_track_dir(self.track_dir)
             except Exception:
                 pass
 
@@ -399,20 +587,15 @@ class BatchRunner:
 
     def persist_and_email(self, result: Dict[str, Any], duration_sec: float) -> Dict[str, Any]:
         results = result.get("results", [])
-        failed_rows = [r for r in results if (r.get("status") or "").lower() not in ("created", "skipped")]
-        skipped_rows = [r for r in results if (r.get("status") or "").lower() == "skipped"]
-
-        result_path = self.batch_dir / "result.json"
-        failed_json_path = self.batch_dir / "failed.json"
-        failed_csv_path = self.batch_dir / "failed.csv"
-        skipped_json_path = self.batch_dir / "skipped.json"
-        skipped_csv_path = self.batch_dir / "skipped.csv"
-
-        write_json(result_path, result)
-        write_json(failed_json_path, failed_rows)
-        write_failed_csv(failed_csv_path, failed_rows)
-        write_json(skipped_json_path, skipped_rows)
-        write_skipped_csv(skipped_csv_path, skipped_rows)
+        # reuse the runner's classification when present (run_force_all_done)
+        failed_rows = result.pop("_failed_rows", None)
+        skipped_rows = result.get("skipped_rows")
+        if failed_rows is None or skipped_rows is None:
+            _, failed, skipped = self._classify(results)
+            failed_rows = failed if failed_rows is None else failed_rows
+            skipped_rows = skipped if skipped_rows is None else skipped_rows
+
+        write_batch_artifacts(self.batch_dir, result, failed_rows, skipped_rows)
 
         # relocate under records' day (derived from results payloads)
         rec_day = self._record_day_from_results(results)
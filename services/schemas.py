@@ -1,8 +1,28 @@
 from __future__ import annotations
 
+from functools import lru_cache
+
 from pydantic import BaseModel, Field, validator
 from decimal import Decimal, ROUND_HALF_UP
 
+_QUANT = Decimal("0.00001")
+
+
+@lru_cache(maxsize=4096)
+def _round_5dp(s: str) -> str:
+    """Quantize a rate string to 5 dp; batches repeat few distinct rates."""
+    q = Decimal(s)
+    if q <= 0:
+        raise ValueError("ExchangeRate must be > 0")
+    q = q.quantize(_QUANT, rounding=ROUND_HALF_UP)
+    return f"{q:.5f}"
+
+
+@lru_cache(maxsize=64)
+def norm_status(status: str | None) -> str:
+    """'  Created ' → 'created'. Rows only carry a handful of distinct values, so cache them."""
+    return (status or "").strip().lower()
+
 
 class ExchangeRateItem(BaseModel):
     ExchangeRateType: str = Field(..., description="e.g. M")
@@ -48,8 +68,4 @@ class ExchangeRateItem(BaseModel):
 
     @validator("ExchangeRate")
     def _5dp(cls, v):  # noqa: N805
-        q = Decimal(str(v))
-        if q <= 0:
-            raise ValueError("ExchangeRate must be > 0")
-        q = q.quantize(Decimal("0.00001"), rounding=ROUND_HALF_UP)
-        return f"{q:.5f}"
+        return _round_5dp(str(v))
@@ -1,13 +1,26 @@
 # services/tracking.py
 from __future__ import annotations
 
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, Iterator, List, Tuple, Optional
 import json
+import mmap
+import os
+import re
 import shutil
+import threading
+import time
 from datetime import datetime
 
-from services.schemas import ExchangeRateItem
+# orjson is optional; stdlib json keeps the dependency soft
+try:
+    import orjson  # type: ignore
+except Exception:  # ImportError or broken wheel
+    orjson = None  # type: ignore
+
+from services.schemas import ExchangeRateItem, norm_status
 from services.config import config
 
 # ---- Standardized tracker status tokens ----
@@ -15,6 +28,9 @@ PENDING = "Pending"
 DONE    = "Done"
 SKIPPED = "Skipped"
 
+# Tracker docs store statuses column-wise: one char per row in doc["statuses"].
+_CODE_FOR = {PENDING: "P", DONE: "D", SKIPPED: "S", "Error": "E"}
+
 # ---- Directory layout helpers ----
 
 def _root() -> Path:
@@ -47,73 +63,446 @@ def tracking_path_for_worker(track_dir: Path, worker_id: int) -> Path:
 
 # ---- File IO helpers ----
 
-def _load_tracking(path: Path) -> Dict[str, Any]:
+# Parsed docs keyed by path, validated against the (st_mtime_ns, st_size) of snapshot + log.
+_DOC_CACHE_MAX = 512
+_DOC_CACHE: "OrderedDict[str, Tuple[Tuple[int, int], Dict[str, Any]]]" = OrderedDict()
+_DOC_CACHE_LOCK = threading.Lock()
+
+def _empty_doc() -> Dict[str, Any]:
+    return {"worker_id": None, "indices": [], "statuses": "", "payloads": [], "extras": {}}
+
+def _status_code(raw: Optional[str]) -> str:
+    return _CODE_FOR[_status_bucket(raw)]
+
+def _migrate_items(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Old row-per-dict layout {"items": [{"index", "status", "payload", **extra}]} -> column layout
+    {"indices": [...], "statuses": "PDS...", "payloads": [...], "extras": {"<index>": {...}}}.
+    """
+    rows = doc.get("items") or []
+    extras: Dict[str, Any] = {}
+    for row in rows:
+        extra = {k: v for k, v in row.items() if k not in ("index", "status", "payload")}
+        if extra:
+            extras[str(row.get("index"))] = extra
+    return {
+        "worker_id": doc.get("worker_id"),
+        "indices": [row.get("index") for row in rows],
+        "statuses": "".join(_status_code(row.get("status")) for row in rows),
+        "payloads": [row.get("payload") or {} for row in rows],
+        "extras": extras,
+    }
+
+def _loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _dumps_tracking(doc: Dict[str, Any]) -> bytes:
+    """Indented UTF-8 JSON; both encoders emit the same '"key": value' layout the scanners rely on."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(doc, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass  # non-JSON-native value: let stdlib report/handle it
+    return json.dumps(doc, indent=2, ensure_ascii=False).encode("utf-8")
+
+def _log_path_for(path: Path) -> Path:
+    """Append-only status log next to the snapshot: driver-<id>.json -> driver-<id>.log"""
+    return path.with_suffix(".log")
+
+def _stat_sig(path: Path) -> Optional[Tuple[int, int]]:
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        st = os.stat(str(path))
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+# ---- Counts sidecar ----
+# driver-<id>.counts holds {"P": n, "D": n, "S": n, "E": n, "sig": [...]} so "any pending?"
+# is answered from a few bytes. "sig" is the snapshot (mtime_ns, size) plus log size it
+# reflects; any write that bypasses the sidecar leaves it stale and readers fall back to
+# scanning. (Not *.json, so it stays out of the driver-*.json globs.)
+
+def _counts_path_for(path: Path) -> Path:
+    return path.with_suffix(".counts")
+
+def _counts_sig(path: Path) -> Optional[List[int]]:
+    snap = _stat_sig(path)
+    if snap is None:
+        return None
+    log = _stat_sig(_log_path_for(path))
+    return [snap[0], snap[1], log[1] if log else 0]
+
+def _read_counts(path: Path, sig: Optional[List[int]] = None) -> Optional[Dict[str, int]]:
+    """Sidecar counts keyed by status code, or None when missing/stale."""
+    try:
+        rec = _loads(_counts_path_for(path).read_bytes())
     except Exception:
-        return {"worker_id": None, "items": []}
+        return None
+    want = sig if sig is not None else _counts_sig(path)
+    if want is None or rec.pop("sig", None) != want:
+        return None
+    return rec
+
+def _write_counts(path: Path, counts: Dict[str, int]) -> None:
+    """Stamp counts with the current snapshot/log signature. Best-effort: it's only a cache."""
+    sig = _counts_sig(path)
+    if sig is None:
+        return
+    rec = {c: int(counts.get(c, 0)) for c in _CODE_FOR.values()}
+    rec["sig"] = sig
+    cpath = _counts_path_for(path)
+    tmp = cpath.with_suffix(".counts.tmp")
+    try:
+        tmp.write_text(json.dumps(rec), encoding="utf-8")
+        os.replace(tmp, cpath)
+    except OSError:
+        pass
+
+def _code_counts(codes: str) -> Dict[str, int]:
+    return {c: codes.count(c) for c in _CODE_FOR.values()}
+
+def _replay_log(doc: Dict[str, Any], log_path: Path) -> None:
+    """
+    Overlay status deltas from the append-only log onto the snapshot columns (last write wins).
+    Each line is {"i": index, "s": status, **extra}; extra fields land in doc["extras"].
+    """
+    try:
+        fh = log_path.open("r", encoding="utf-8")
+    except OSError:
+        return
+    indices = doc.get("indices", [])
+    pos = {idx: i for i, idx in enumerate(indices)}
+    codes = bytearray(doc.get("statuses", ""), "ascii")
+    extras = doc.setdefault("extras", {})
+    with fh:
+        for line in fh:
+            try:
+                rec = _loads(line)
+            except Exception:
+                continue  # torn tail line from an interrupted append
+            i = pos.get(rec.pop("i", None))
+            if i is None:
+                continue
+            if "s" in rec:
+                codes[i] = ord(_status_code(rec.pop("s")))
+            if rec:
+                extras.setdefault(str(indices[i]), {}).update(rec)
+    doc["statuses"] = codes.decode("ascii")
+
+def _load_tracking(path: Path) -> Dict[str, Any]:
+    """
+    Parsed tracker doc (snapshot + replayed status log). Unchanged files are served
+    from an in-process cache, and every caller shares the cached object: treat it as
+    read-only (writes go through the status log, never through the doc).
+    """
+    key = str(path)
+    snap_sig = _stat_sig(path)
+    if snap_sig is None:
+        return _empty_doc()
+    log_path = _log_path_for(path)
+    sig = (snap_sig, _stat_sig(log_path))
+
+    with _DOC_CACHE_LOCK:
+        hit = _DOC_CACHE.get(key)
+        if hit is not None and hit[0] == sig:
+            _DOC_CACHE.move_to_end(key)
+            doc = hit[1]
+        else:
+            doc = None
+
+    if doc is None:
+        try:
+            doc = _loads(path.read_bytes())
+        except Exception:
+            return _empty_doc()
+        if "items" in doc:
+            doc = _migrate_items(doc)  # pre-column tracker; rewritten as columns on compaction
+        if sig[1] is not None:
+            _replay_log(doc, log_path)
+        with _DOC_CACHE_LOCK:
+            _DOC_CACHE[key] = (sig, doc)
+            _DOC_CACHE.move_to_end(key)
+            while len(_DOC_CACHE) > _DOC_CACHE_MAX:
+                _DOC_CACHE.popitem(last=False)
+
+    return doc
+
+def _invalidate_cached(path: Path) -> None:
+    with _DOC_CACHE_LOCK:
+        _DOC_CACHE.pop(str(path), None)
+
+# O_BINARY keeps Windows from translating newlines on a raw fd; fdatasync (data only,
+# no metadata flush) is POSIX-only, fsync covers the rest.
+_TMP_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+_fdatasync = getattr(os, "fdatasync", os.fsync)
 
 def _save_tracking_atomic(path: Path, doc: Dict[str, Any]) -> None:
+    data = _dumps_tracking(doc)
+    sig = _stat_sig(path)
+    if sig is not None and sig[1] == len(data):
+        try:
+            if path.read_bytes() == data:
+                return  # identical content: skip tmp write + rename
+        except OSError:
+            pass
+    _write_bytes_atomic(path, data)
+
+def _write_bytes_atomic(path: Path, data: bytes) -> None:
     tmp = path.with_suffix(".json.tmp")
-    tmp.write_text(json.dumps(doc, indent=2, ensure_ascii=False), encoding="utf-8")
-    tmp.replace(path)
+    fd = os.open(tmp, _TMP_OPEN_FLAGS, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        _fdatasync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+    _invalidate_cached(path)
+
+def compact_tracking(path: Path) -> None:
+    """
+    Fold the status log into the snapshot (one atomic rewrite) and drop the log.
+    """
+    log_path = _log_path_for(path)
+    if not log_path.exists():
+        return
+    doc = _load_tracking(path)
+    if not doc.get("indices"):
+        return  # unreadable snapshot: keep the log rather than lose it
+    _save_tracking_atomic(path, doc)
+    try:
+        log_path.unlink()
+    except FileNotFoundError:
+        pass
+    _invalidate_cached(path)
+    _write_counts(path, _code_counts(doc.get("statuses", "")))
 
 # ---- Initialize / Update ----
 
-def init_tracking_files(track_dir: Path, shards: List[List[Tuple[int, ExchangeRateItem]]]) -> None:
+def init_tracking_files(track_dir: Path, items: List[ExchangeRateItem], bounds: List[Tuple[int, int]]) -> None:
     """
     Create one JSON per worker with each row initialized as Pending.
+    bounds are the (start, end) ranges from chunk_evenly; row index is 1-based.
+    All shards are serialized up front, then written in parallel: each write ends in
+    an fdatasync, which releases the GIL, so W files cost ~one sync latency, not W.
     """
     track_dir.mkdir(parents=True, exist_ok=True)
-    for w_id, shard in enumerate(shards, start=1):
+    new: List[Tuple[Path, bytes, str]] = []
+    for w_id, (start, end) in enumerate(bounds, start=1):
         path = tracking_path_for_worker(track_dir, w_id)
         if path.exists():
             # keep existing (supports driver restarts)
             continue
+        try:
+            _log_path_for(path).unlink()  # stale log from an earlier batch with the same id
+        except FileNotFoundError:
+            pass
         doc = {
             "worker_id": w_id,
-            "items": [{"index": idx, "status": PENDING, "payload": it.dict()} for (idx, it) in shard],
+            "indices": [i + 1 for i in range(start, end)],
+            "statuses": _CODE_FOR[PENDING] * (end - start),
+            "payloads": [items[i].dict() for i in range(start, end)],
+            "extras": {},
         }
-        _save_tracking_atomic(path, doc)
+        new.append((path, _dumps_tracking(doc), doc["statuses"]))
+    if len(new) > 1:
+        with ThreadPoolExecutor(max_workers=min(16, len(new))) as ex:
+            list(ex.map(lambda t: _write_new_tracker(*t), new))
+    elif new:
+        _write_new_tracker(*new[0])
+
+def _write_new_tracker(path: Path, data: bytes, statuses: str) -> None:
+    _write_bytes_atomic(path, data)
+    _write_counts(path, _code_counts(statuses))
+
+# 'done ' / 'PENDING' etc. are written back in canonical case so readers hit the exact-match path
+_CANONICAL_SPELLING = {s.lower(): s for s in (PENDING, DONE, SKIPPED, "Error", "Created")}
+
+def _status_line(index: int, status: str, extra: Optional[Dict[str, Any]] = None) -> str:
+    if status not in _STATUS_BUCKET_CANON:
+        status = _CANONICAL_SPELLING.get((status or "").strip().lower(), status)
+    rec: Dict[str, Any] = {"i": index, "s": status}
+    if extra:
+        rec.update(extra)
+    return json.dumps(rec, ensure_ascii=False) + "\n"
+
+def append_item_status(path: Path, index: int, status: str, extra: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Record one status transition as a single line in the worker's append-only log.
+    """
+    with _log_path_for(path).open("a", encoding="utf-8", buffering=1) as fh:
+        fh.write(_status_line(index, status, extra))
 
-def mark_item_status(path: Path, index: int, status: str, extra: Optional[Dict[str, Any]] = None) -> None:
+class _FlushScheduler:
     """
-    Update a single item inside a worker tracking file.
-    status should be one of: Pending / Done / Skipped / Error ...
+    One daemon thread that runs the time-based flushes of every TrackerWriter,
+    instead of a threading.Timer (and a new thread) per flush window.
     """
-    doc = _load_tracking(path)
-    changed = False
-    for row in doc.get("items", []):
-        if row.get("index") == index:
-            row["status"] = status
-            if extra:
-                row.update(extra)
-            changed = True
-            break
-    if changed:
-        _save_tracking_atomic(path, doc)
 
-def iter_pending_items(path: Path) -> List[Tuple[int, ExchangeRateItem]]:
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._due: Dict["TrackerWriter", float] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, writer: "TrackerWriter", delay: float) -> None:
+        with self._cond:
+            if writer in self._due:
+                return
+            self._due[writer] = time.monotonic() + delay
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="tracker-flush", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def cancel(self, writer: "TrackerWriter") -> None:
+        with self._cond:
+            self._due.pop(writer, None)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._due:
+                    self._cond.wait()
+                now = time.monotonic()
+                due = [w for w, t in self._due.items() if t <= now]
+                if not due:
+                    self._cond.wait(min(self._due.values()) - now)
+                    continue
+                for w in due:
+                    del self._due[w]
+            # flush outside the condition: writers call schedule/cancel under their own lock
+            for w in due:
+                try:
+                    w.flush()
+                except Exception:
+                    pass
+
+_FLUSHER = _FlushScheduler()
+
+class TrackerWriter:
+    """
+    Per-worker coalescer for status transitions.
+    Buffers log lines and appends them in one write every `flush_every` updates
+    or `flush_ms` after the first buffered update, whichever comes first
+    (time-based flushes run on the shared _FLUSHER thread).
+    Each flush restamps the counts sidecar from counts kept in memory.
+    close() flushes and compacts the log into the snapshot.
+    Safe to share between worker threads (one writer per tracker file).
     """
-    Only return items currently Pending in this track file.
+
+    def __init__(self, path: Path, flush_every: int = 32, flush_ms: int = 250):
+        self.path = path
+        self.flush_every = max(1, int(flush_every))
+        self.flush_ms = max(0, int(flush_ms))
+        self._buf: List[str] = []
+        self._last: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._scheduled = False
+        doc = _load_tracking(path)
+        self._codes = bytearray(doc.get("statuses", ""), "ascii")
+        self._pos = {idx: i for i, idx in enumerate(doc.get("indices", []))}
+        self._counts = _code_counts(doc.get("statuses", ""))
+
+    def update(self, index: int, status: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        line = _status_line(index, status, extra)
+        with self._lock:
+            if not extra and self._last.get(index) == status:
+                return  # idempotent re-mark
+            self._last[index] = status
+            i = self._pos.get(index)
+            if i is not None:
+                new = ord(_status_code(status))
+                if self._codes[i] != new:
+                    self._counts[chr(self._codes[i])] -= 1
+                    self._counts[chr(new)] += 1
+                    self._codes[i] = new
+            self._buf.append(line)
+            full = len(self._buf) >= self.flush_every
+            if not full and not self._scheduled and self.flush_ms:
+                self._scheduled = True
+                _FLUSHER.schedule(self, self.flush_ms / 1000.0)
+        if full or not self.flush_ms:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._scheduled:
+                self._scheduled = False
+                _FLUSHER.cancel(self)
+            if not self._buf:
+                return
+            data = "".join(self._buf)
+            self._buf.clear()
+            with _log_path_for(self.path).open("a", encoding="utf-8") as fh:
+                fh.write(data)
+                fh.flush()
+                _fdatasync(fh.fileno())  # one sync per batch, so a crash loses at most one window
+            _write_counts(self.path, self._counts)
+
+    def close(self) -> None:
+        self.flush()
+        compact_tracking(self.path)
+
+    def __enter__(self) -> "TrackerWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+# Validated ExchangeRateItem per row index. Payloads are written once at init, so
+# entries stay valid until the snapshot itself is rewritten (status-log appends don't).
+_ITEM_CACHE: "OrderedDict[str, Tuple[Optional[Tuple[int, int]], Dict[int, ExchangeRateItem]]]" = OrderedDict()
+
+def _validated_items_for(path: Path) -> Dict[int, ExchangeRateItem]:
+    key = str(path)
+    sig = _stat_sig(path)
+    with _DOC_CACHE_LOCK:
+        hit = _ITEM_CACHE.get(key)
+        if hit is None or hit[0] != sig:
+            hit = (sig, {})
+            _ITEM_CACHE[key] = hit
+        _ITEM_CACHE.move_to_end(key)
+        while len(_ITEM_CACHE) > _DOC_CACHE_MAX:
+            _ITEM_CACHE.popitem(last=False)
+        return hit[1]
+
+def iter_pending_items(path: Path, writer: Optional[TrackerWriter] = None) -> Iterator[Tuple[int, ExchangeRateItem]]:
+    """
+    Lazily yield (index, item) for rows currently Pending in this track file, in row order.
+    Statuses are those of the snapshot + log when iteration starts.
+    Pass the file's live TrackerWriter, if any, so malformed rows are marked through it
+    (a direct append would be overwritten by the writer's in-memory counts).
     """
     doc = _load_tracking(path)
-    out: List[Tuple[int, ExchangeRateItem]] = []
-    changed = False
-    for row in doc.get("items", []):
-        st = (row.get("status") or "").strip()
-        if st.lower() == PENDING.lower():
-            payload = row.get("payload") or {}
+    statuses, indices, payloads = doc.get("statuses", ""), doc.get("indices", []), doc.get("payloads", [])
+    p = _CODE_FOR[PENDING]
+    i = statuses.find(p)
+    if i < 0:
+        return
+    validated = _validated_items_for(path)
+    while i >= 0:
+        idx = indices[i]
+        item = validated.get(idx)
+        if item is None:
             try:
-                item = ExchangeRateItem(**payload)
-                out.append((row.get("index"), item))
+                item = ExchangeRateItem(**(payloads[i] or {}))
+                validated[idx] = item
             except Exception:
                 # malformed → mark Error to avoid loops
-                row["status"] = "Error"
-                changed = True
-    if changed:
-        _save_tracking_atomic(path, doc)
-    return out
+                if writer is not None:
+                    writer.update(idx, "Error")
+                else:
+                    append_item_status(path, idx, "Error")
+        if item is not None:
+            yield idx, item
+        i = statuses.find(p, i + 1)
+
+def count_pending(path: Path) -> int:
+    """Pending rows in one tracker, from the counts sidecar or a byte scan (no payload parsing)."""
+    return _tracker_counts(path)[1][PENDING]
 
 def pending_rows_for_report(path: Path) -> list[dict]:
     """
@@ -121,25 +510,126 @@ def pending_rows_for_report(path: Path) -> list[dict]:
     """
     doc = _load_tracking(path)
     out: list[dict] = []
-    for row in doc.get("items", []):
-        if (row.get("status") or "").strip().lower() == PENDING.lower():
-            out.append({
-                "index": row.get("index"),
-                "status": PENDING,
-                "payload": row.get("payload") or {},
-            })
+    statuses, indices, payloads = doc.get("statuses", ""), doc.get("indices", []), doc.get("payloads", [])
+    p = _CODE_FOR[PENDING]
+    i = statuses.find(p)
+    while i >= 0:
+        out.append({
+            "index": indices[i],
+            "status": PENDING,
+            "payload": payloads[i] or {},
+        })
+        i = statuses.find(p, i + 1)
     return out
 
 # ---- Live -> Finished archiving & pruning ----
 
+# Sorted driver-*.json paths per tracker dir, keyed by the dir's st_mtime_ns. Adding or
+# removing a file bumps the dir mtime, so steady-state polls cost one stat().
+_DRIVER_FILES_CACHE: Dict[str, Tuple[int, Tuple[Path, ...]]] = {}
+_DRIVER_FILES_LOCK = threading.Lock()
+
+def _list_driver_files(track_dir: Path) -> Tuple[Path, ...]:
+    key = str(track_dir)
+    try:
+        mtime = os.stat(key).st_mtime_ns
+    except OSError:
+        with _DRIVER_FILES_LOCK:
+            _DRIVER_FILES_CACHE.pop(key, None)
+        return ()
+    with _DRIVER_FILES_LOCK:
+        hit = _DRIVER_FILES_CACHE.get(key)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+    with os.scandir(key) as it:
+        names = sorted(e.name for e in it if e.name.startswith("driver-") and e.name.endswith(".json"))
+    files = tuple(track_dir / n for n in names)
+    with _DRIVER_FILES_LOCK:
+        _DRIVER_FILES_CACHE[key] = (mtime, files)
+    return files
+
+# Writers emit canonical json.dumps separators, so these literals are stable.
+# Log lines (and pre-column snapshots) spell the status out; column snapshots hold it
+# as a 'P' inside the "statuses" string.
+_PENDING_NEEDLES = (b'"status": "Pending"', b'"s": "Pending"', b'"status": "pending"', b'"s": "pending"')
+_STATUSES_KEY = b'"statuses":'
+
+def _file_mentions_pending(path: Path) -> bool:
+    """Zero-copy scan for a Pending status; False for missing/empty files."""
+    try:
+        with open(path, "rb") as fh:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if any(mm.find(n) != -1 for n in _PENDING_NEEDLES):
+                    return True
+                k = mm.find(_STATUSES_KEY)
+                if k == -1:
+                    return False
+                q = mm.find(b'"', k + len(_STATUSES_KEY))
+                end = mm.find(b'"', q + 1) if q != -1 else -1
+                return end != -1 and mm.find(b"P", q + 1, end) != -1
+    except (OSError, ValueError):
+        return False
+
 def _dir_has_any_pending(track_dir: Path) -> bool:
-    for f in sorted(track_dir.glob("driver-*.json")):
-        doc = _load_tracking(f)
-        for row in doc.get("items", []):
-            if (row.get("status") or "").strip().lower() == PENDING.lower():
+    for f in _list_driver_files(track_dir):
+        counts = _read_counts(f)
+        if counts is not None:
+            if counts.get(_CODE_FOR[PENDING], 0) > 0:
                 return True
+            continue
+        if not (_file_mentions_pending(f) or _file_mentions_pending(_log_path_for(f))):
+            continue
+        # a Pending literal may be superseded by a later log line: confirm per row
+        _, codes = _scan_tracker(f)
+        if _CODE_FOR[PENDING] in codes:
+            return True
     return False
 
+def _fast_rmdir_flat(d: Path) -> None:
+    """
+    Remove a tracker dir (flat: driver-*.json/.log/.counts). One scandir + unlink per
+    file + rmdir; anything unexpected (subdirs) falls back to rmtree.
+    """
+    try:
+        with os.scandir(d) as it:
+            for e in it:
+                try:
+                    os.unlink(e.path)
+                except OSError:
+                    pass  # already gone, or a subdir that rmtree below picks up
+    except FileNotFoundError:
+        return
+    except OSError:
+        pass
+    try:
+        os.rmdir(d)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        shutil.rmtree(d, ignore_errors=True)
+
+def _move_dir(src: Path, dest: Path) -> None:
+    """
+    Rename src -> dest (Live and Finished normally share a filesystem under _root()).
+    If dest already exists (POSIX: ENOTEMPTY/EEXIST; Windows: EACCES/EPERM, since
+    replace never overwrites a directory there) it is cleared and the rename retried
+    once. Anything still failing (e.g. EXDEV) pays for shutil.move's copy + delete.
+    """
+    try:
+        os.replace(src, dest)
+        return
+    except OSError:
+        if dest.exists():
+            _fast_rmdir_flat(dest)
+            try:
+                os.replace(src, dest)
+                return
+            except OSError:
+                pass
+    if dest.exists():
+        _fast_rmdir_flat(dest)
+    shutil.move(str(src), str(dest))
+
 def move_live_to_finished(batch_id: str, track_dir: Optional[Path] = None, day: Optional[str] = None) -> Dict[str, Any]:
     """
     If the batch's live tracker has NO Pending rows, move it under Finished/YYYY-MM-DD/<batch_id>.
@@ -153,12 +643,17 @@ def move_live_to_finished(batch_id: str, track_dir: Optional[Path] = None, day:
     if _dir_has_any_pending(tdir):
         return {"ok": False, "reason": "still_pending", "batch_id": batch_id, "path": str(tdir)}
 
+    for f in _list_driver_files(tdir):
+        try:
+            compact_tracking(f)
+        except Exception:
+            pass
+
     dest_root = _finished_root_for_day(day)
     dest = dest_root / batch_id
+    forget_track_dir(tdir)
     try:
-        if dest.exists():
-            shutil.rmtree(dest, ignore_errors=True)
-        shutil.move(str(tdir), str(dest))
+        _move_dir(tdir, dest)
         return {"ok": True, "moved_to": str(dest), "batch_id": batch_id}
     except Exception as e:
         return {"ok": False, "reason": f"move_failed: {type(e).__name__}: {e}", "batch_id": batch_id}
@@ -172,8 +667,11 @@ def prune_live_trackers_keep_last_n(keep_n: int = 10) -> Dict[str, Any]:
     if not lr.exists():
         return {"ok": True, "deleted": [], "kept": []}
 
-    dirs = [d for d in lr.iterdir() if d.is_dir()]
-    dirs.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+    # scandir DirEntry caches type + stat from the directory read
+    with os.scandir(lr) as it:
+        entries = [(Path(e.path), e.stat().st_mtime) for e in it if e.is_dir(follow_symlinks=False)]
+    entries.sort(key=lambda t: t[1], reverse=True)
+    dirs = [p for p, _ in entries]
 
     to_keep = dirs[:keep_n] if keep_n > 0 else []
     to_delete = dirs[keep_n:] if keep_n >= 0 else []
@@ -181,7 +679,8 @@ def prune_live_trackers_keep_last_n(keep_n: int = 10) -> Dict[str, Any]:
     deleted = []
     for d in to_delete:
         try:
-            shutil.rmtree(d, ignore_errors=True)
+            _fast_rmdir_flat(d)
+            forget_track_dir(d)
             deleted.append(str(d))
         except Exception:
             pass
@@ -190,24 +689,132 @@ def prune_live_trackers_keep_last_n(keep_n: int = 10) -> Dict[str, Any]:
 
 # ---- Live status summary (for routes/currency.py) ----
 
-def _count_statuses_in_doc(doc: Dict[str, Any]) -> Dict[str, int]:
+_PENDING_LC = PENDING.lower()
+_DONE_LC = DONE.lower()
+_SKIPPED_LC = SKIPPED.lower()
+_STATUS_BUCKET = {_DONE_LC: DONE, "created": DONE, _SKIPPED_LC: SKIPPED, _PENDING_LC: PENDING}
+# writers store these spellings, so the common case is one exact-match lookup
+_STATUS_BUCKET_CANON = {DONE: DONE, SKIPPED: SKIPPED, PENDING: PENDING, "Error": "Error", "Created": DONE}
+
+def _status_bucket(raw: Optional[str]) -> str:
     """
-    Count normalized statuses in a single tracking doc.
     Normalization: 'created' -> Done, 'skipped' -> Skipped, 'pending' -> Pending.
     Anything else -> Error.
     """
-    counts = {DONE: 0, SKIPPED: 0, PENDING: 0, "Error": 0}
-    for row in doc.get("items", []):
-        raw = (row.get("status") or "").strip().lower()
-        if raw == "done" or raw == "created":
-            counts[DONE] += 1
-        elif raw == "skipped":
-            counts[SKIPPED] += 1
-        elif raw == "pending":
-            counts[PENDING] += 1
-        else:
-            counts["Error"] += 1
-    return counts
+    b = _STATUS_BUCKET_CANON.get(raw)  # type: ignore[arg-type]
+    if b is not None:
+        return b
+    return _STATUS_BUCKET.get(norm_status(raw), "Error")
+
+def _buckets(by_code: Dict[str, int]) -> Dict[str, int]:
+    """{code: n} -> {Done/Skipped/Pending/Error: n}"""
+    return {b: int(by_code.get(_CODE_FOR[b], 0)) for b in (DONE, SKIPPED, PENDING, "Error")}
+
+def _count_codes(codes: str) -> Dict[str, int]:
+    return _buckets(_code_counts(codes))
+
+# Snapshots carry "indices": [...] and "statuses": "PDS..." ahead of the payloads; log
+# lines are {"i": N, "s": "...", ...}. Pre-column snapshots have {"index": N, "status": "..."}
+# rows. Scanning those spans skips parsing the payloads.
+_INDICES_RE = re.compile(rb'"indices":\s*\[([^\]]*)\]')
+_STATUSES_RE = re.compile(rb'"statuses":\s*"([A-Z]*)"')
+_ROW_STATUS_RE = re.compile(rb'"index":\s*(-?\d+),\s*"status":\s*"([^"]*)"')
+_LOG_STATUS_RE = re.compile(rb'^\{"i":\s*(-?\d+),\s*"s":\s*"([^"]*)"', re.M)
+_WORKER_ID_RE = re.compile(rb'"worker_id":\s*(-?\d+)')
+
+def _scan_tracker(path: Path) -> Tuple[Optional[int], str]:
+    """
+    (worker_id, status codes) for one tracker (snapshot + log) without materializing
+    payloads; codes[i] is the one-char status of the i-th row. Falls back to the full
+    loader for non-canonical layouts.
+    """
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None, ""
+    indices: List[int] = []
+    codes = bytearray()
+    sm = _STATUSES_RE.search(data)
+    if sm is not None:
+        im = _INDICES_RE.search(data)
+        if im is not None:
+            indices = [int(x) for x in im.group(1).split(b",") if x.strip()]
+            codes = bytearray(sm.group(1))
+    else:
+        for m in _ROW_STATUS_RE.finditer(data):
+            indices.append(int(m.group(1)))
+            codes += _status_code(m.group(2).decode("utf-8", "replace")).encode("ascii")
+    if len(indices) != len(codes) or (not codes and (b'"index"' in data or b'"indices"' in data)):
+        doc = _load_tracking(path)
+        return doc.get("worker_id"), doc.get("statuses", "")
+
+    m = _WORKER_ID_RE.search(data)
+    wid = int(m.group(1)) if m else None
+    try:
+        log = _log_path_for(path).read_bytes()
+    except OSError:
+        log = b""
+    if log:
+        pos = {idx: i for i, idx in enumerate(indices)}
+        for m in _LOG_STATUS_RE.finditer(log):
+            i = pos.get(int(m.group(1)))
+            if i is not None:
+                codes[i] = ord(_status_code(m.group(2).decode("utf-8", "replace")))
+    return wid, codes.decode("ascii")
+
+# Per-file (worker_id, counts) for the summary endpoint, keyed by path and
+# validated against the snapshot + log stat signatures: one stat() per poll.
+_SUMMARY_CACHE: Dict[str, Tuple[Any, Optional[int], Dict[str, int]]] = {}
+_SUMMARY_CACHE_LOCK = threading.Lock()
+
+def _read_head(path: Path, n: int = 256) -> bytes:
+    """worker_id is written first, so the snapshot prefix is enough to find it."""
+    try:
+        with open(path, "rb") as fh:
+            return fh.read(n)
+    except OSError:
+        return b""
+
+def _tracker_counts(path: Path) -> Tuple[Optional[int], Dict[str, int]]:
+    key = str(path)
+    sig = (_stat_sig(path), _stat_sig(_log_path_for(path)))
+    with _SUMMARY_CACHE_LOCK:
+        hit = _SUMMARY_CACHE.get(key)
+    if hit is not None and hit[0] == sig:
+        return hit[1], dict(hit[2])
+    side = _read_counts(path)
+    if side is not None:
+        m = _WORKER_ID_RE.search(_read_head(path))
+        wid = int(m.group(1)) if m else None
+        counts = _buckets(side)
+    else:
+        wid, codes = _scan_tracker(path)
+        counts = _count_codes(codes)
+    with _SUMMARY_CACHE_LOCK:
+        _SUMMARY_CACHE[key] = (sig, wid, counts)
+    return wid, dict(counts)
+
+def forget_track_dir(track_dir: Path) -> None:
+    """Drop every cached doc/item/summary/listing for files under track_dir (call when it is deleted or moved)."""
+    key = str(track_dir)
+    prefix = key + os.sep
+    with _DOC_CACHE_LOCK:
+        for cache in (_DOC_CACHE, _ITEM_CACHE):
+            for k in [k for k in cache if k.startswith(prefix)]:
+                del cache[k]
+    with _SUMMARY_CACHE_LOCK:
+        for k in [k for k in _SUMMARY_CACHE if k.startswith(prefix)]:
+            del _SUMMARY_CACHE[k]
+    with _DRIVER_FILES_LOCK:
+        _DRIVER_FILES_CACHE.pop(key, None)
+
+def _zero_counts() -> Counter:
+    # Counter.update() adds counts (in C); zero-seeded so every bucket shows up in the output
+    return Counter({DONE: 0, SKIPPED: 0, PENDING: 0, "Error": 0})
+
+def _count_statuses_fast(path: Path) -> Dict[str, int]:
+    """Status counts for one tracker file via _scan_tracker (no payload parsing), cached by stat."""
+    return _tracker_counts(path)[1]
 
 def read_live_status_summary(batch_id: Optional[str] = None, track_dir: Optional[Path] = None) -> Dict[str, Any]:
     """
@@ -222,41 +829,38 @@ def read_live_status_summary(batch_id: Optional[str] = None, track_dir: Optional
         if batch_id:
             track_dir = lr / batch_id
         else:
-            # global summary across all live batches
-            batches = []
-            for bdir in sorted([d for d in lr.iterdir() if d.is_dir()]):
-                b_tot = {DONE: 0, SKIPPED: 0, PENDING: 0, "Error": 0}
-                for f in sorted(bdir.glob("driver-*.json")):
-                    doc = _load_tracking(f)
-                    c = _count_statuses_in_doc(doc)
-                    for k, v in c.items():
-                        b_tot[k] = b_tot.get(k, 0) + int(v)
-                batches.append({"batch_id": bdir.name, "totals": b_tot, "path": str(bdir)})
-            grand = {DONE: 0, SKIPPED: 0, PENDING: 0, "Error": 0}
-            for b in batches:
-                for k, v in b["totals"].items():
-                    grand[k] = grand.get(k, 0) + int(v)
-            return {"ok": True, "scope": "all", "totals": grand, "batches": batches, "live_root": str(lr)}
+            # global summary across all live batches; per-file reads fan out over a pool
+            bdirs = sorted([d for d in lr.iterdir() if d.is_dir()])
+            pairs = [(bdir.name, f) for bdir in bdirs for f in _list_driver_files(bdir)]
+            per_batch: Dict[str, Counter] = {bdir.name: _zero_counts() for bdir in bdirs}
+            if pairs:
+                with ThreadPoolExecutor(max_workers=min(32, len(pairs))) as ex:
+                    counted = ex.map(_count_statuses_fast, [f for _, f in pairs])
+                    for (name, _), c in zip(pairs, counted):
+                        per_batch[name].update(c)
+            grand = _zero_counts()
+            for c in per_batch.values():
+                grand.update(c)
+            # plain dicts at the boundary keep the JSON shape unchanged
+            batches = [{"batch_id": bdir.name, "totals": dict(per_batch[bdir.name]), "path": str(bdir)} for bdir in bdirs]
+            return {"ok": True, "scope": "all", "totals": dict(grand), "batches": batches, "live_root": str(lr)}
 
     # single batch dir summary
     if not track_dir.exists():
         return {"ok": False, "reason": "not_found", "path": str(track_dir)}
     by_worker = []
-    totals = {DONE: 0, SKIPPED: 0, PENDING: 0, "Error": 0}
-    for f in sorted(track_dir.glob("driver-*.json")):
-        doc = _load_tracking(f)
-        wid = doc.get("worker_id")
-        c = _count_statuses_in_doc(doc)
+    totals = _zero_counts()
+    for f in _list_driver_files(track_dir):
+        wid, c = _tracker_counts(f)
         by_worker.append({"worker_id": wid, "file": f.name, "totals": c})
-        for k, v in c.items():
-            totals[k] = totals.get(k, 0) + int(v)
+        totals.update(c)
 
     return {
         "ok": True,
         "scope": "batch",
         "batch_id": batch_id or track_dir.name,
         "path": str(track_dir),
-        "totals": totals,
+        "totals": dict(totals),
         "by_worker": by_worker,
         "has_pending": totals.get(PENDING, 0) > 0,
     }
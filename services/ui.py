@@ -2,10 +2,92 @@
 from selenium.webdriver.support.ui import WebDriverWait
 from services.config import EXPLICIT_WAIT_SEC
 from core.base import fluent_wait
+from pages.Login.elements.Username.selectors import USERNAME_INPUT
+from pages.Login.elements.Password.selectors import PASSWORD_INPUT
+from pages.Login.elements.Submit.selectors import SUBMIT_BTN
+
+# Readiness probes are installed once per document as window functions, so each
+# wait tick only sends `return window.__x()` instead of re-shipping/parsing the body.
+_UI5_HELPERS_JS = """
+if (!window.__uiState) {
+  window.__ui5Ready = function () {
+    try {
+      if (document.readyState !== 'complete') return false;
+      if (window.sap && sap.ui && sap.ui.getCore) {
+        var core = sap.ui.getCore();
+        if (core && core.isInitialized && !core.isInitialized()) return false;
+        if (core && core.getUIDirty && core.getUIDirty()) return false;
+      }
+      return true;
+    } catch (e) { return true; }
+  };
+  window.__shellHomeReady = function () {
+    try {
+      if (!window.sap || !sap.ui) return false;
+      if (sap.ushell && sap.ushell.Container) return true;
+      var core = sap.ui.getCore && sap.ui.getCore();
+      if (!core) return false;
+      if (core.isInitialized && !core.isInitialized()) return false;
+      return true;
+    } catch (e) { return false; }
+  };
+  window.__searchReady = function () {
+    try {
+      // one selector list = one DOM traversal
+      var hasSearch = !!document.querySelector(
+        "a#sf.sapUshellShellHeadItm, "
+        + "a.sapUshellShellHeadItm[data-help-id='shellHeader-search'], "
+        + "a.sapUshellShellHeadItm[role='button'][aria-label*='Search']"
+      );
+      if (hasSearch) return true;
+      if (window.sap && sap.ushell && sap.ushell.Container) {
+         var r = sap.ushell.Container.getRenderer && sap.ushell.Container.getRenderer();
+         if (r) return true;
+      }
+      return false;
+    } catch (e) { return false; }
+  };
+  window.__uiState = function () {
+    return {
+      shell_home: !!window.__shellHomeReady(),
+      ui5_idle: !!window.__ui5Ready(),
+      search_ready: !!window.__searchReady()
+    };
+  };
+}
+return true;
+"""
+
+def _ensure_ui5_helpers(driver) -> None:
+    """Idempotently install window.__ui5Ready / __shellHomeReady / __searchReady / __uiState."""
+    try:
+        driver.execute_script(_UI5_HELPERS_JS)
+    except Exception:
+        pass
+
+def _probe_state(driver) -> dict:
+    """One WebDriver round-trip returning {shell_home, ui5_idle, search_ready}."""
+    probe = "return window.__uiState ? window.__uiState() : null;"
+    r = driver.execute_script(probe)
+    if r is None:
+        # a new document (login redirect, reload) dropped the helpers: reinstall once
+        _ensure_ui5_helpers(driver)
+        r = driver.execute_script(probe)
+    return r or {}
+
+def wait_combined(driver, needs=("shell_home", "ui5_idle"), timeout: int | None = None) -> bool:
+    """
+    Wait until every state in `needs` ("shell_home", "ui5_idle", "search_ready") holds,
+    polling all of them with a single execute_script per tick.
+    """
+    t = timeout or EXPLICIT_WAIT_SEC
+
+    def _ready(d) -> bool:
+        state = _probe_state(d)
+        return all(state.get(k) for k in needs)
 
-def _wait_js(driver, script: str, timeout: int) -> bool:
     try:
-        fluent_wait(driver, timeout).until(lambda d: bool(d.execute_script(script)))
+        fluent_wait(driver, t).until(_ready)
         return True
     except Exception:
         return False
@@ -25,35 +107,36 @@ def wait_for_shell_home(driver, timeout: int | None = None) -> bool:
     except Exception:
         pass
 
-    js = """
-    try {
-      if (!window.sap || !sap.ui) return false;
-      if (sap.ushell && sap.ushell.Container) return true;
-      var core = sap.ui.getCore && sap.ui.getCore();
-      if (!core) return false;
-      if (core.isInitialized && !core.isInitialized()) return false;
-      return true;
-    } catch (e) { return false; }
+    return wait_combined(driver, ("shell_home",), t)
+
+# The logon form is served at the same #Shell-home URL, so a URL check cannot tell a
+# reused session from a rejected one: look for the ushell container and the form itself.
+_AUTH_STATE_JS = """
+try {
+  if (document.querySelector("%s, %s, %s")) return "login";
+  if (window.sap && sap.ushell && sap.ushell.Container) return "auth";
+} catch (e) {}
+return null;
+""" % (USERNAME_INPUT, PASSWORD_INPUT, SUBMIT_BTN)
+
+def wait_authenticated(driver, timeout: int | None = None) -> bool:
+    """
+    True once the page is the launchpad of a logged-in session (sap.ushell.Container
+    present, no logon form); False as soon as the logon form shows up, or on timeout.
     """
-    return _wait_js(driver, js, t)
+    t = timeout or EXPLICIT_WAIT_SEC
+    try:
+        state = fluent_wait(driver, t).until(lambda d: d.execute_script(_AUTH_STATE_JS))
+    except Exception:
+        return False
+    return state == "auth"
 
 def wait_ui5_idle(driver, timeout: int | None = None) -> bool:
     """
     Lightweight 'settled' check for UI5 renderer and DOM idle enough to interact.
     """
     t = timeout or EXPLICIT_WAIT_SEC
-    js = """
-    try {
-      if (document.readyState !== 'complete') return false;
-      if (window.sap && sap.ui && sap.ui.getCore) {
-        var core = sap.ui.getCore();
-        if (core && core.isInitialized && !core.isInitialized()) return false;
-        if (core && core.getUIDirty && core.getUIDirty()) return false;
-      }
-      return true;
-    } catch (e) { return true; }
-    """
-    return _wait_js(driver, js, t)
+    return wait_combined(driver, ("ui5_idle",), t)
 
 def wait_url_contains(driver, needle: str, timeout: int | None = None) -> bool:
     t = timeout or EXPLICIT_WAIT_SEC
@@ -72,20 +155,7 @@ def wait_shell_search_ready(driver, timeout: int | None = None) -> bool:
     Wait until the FLP header search control is available OR the renderer exists.
     """
     t = timeout or EXPLICIT_WAIT_SEC
-    js = """
-    try {
-      var hasSearch = !!document.querySelector('a#sf.sapUshellShellHeadItm')
-                   || !!document.querySelector("a.sapUshellShellHeadItm[data-help-id='shellHeader-search']")
-                   || !!document.querySelector("a.sapUshellShellHeadItm[role='button'][aria-label*='Search']");
-      if (hasSearch) return true;
-      if (window.sap && sap.ushell && sap.ushell.Container) {
-         var r = sap.ushell.Container.getRenderer && sap.ushell.Container.getRenderer();
-         if (r) return true;
-      }
-      return false;
-    } catch(e){ return false; }
-    """
-    return _wait_js(driver, js, t)
+    return wait_combined(driver, ("search_ready",), t)
 
 def open_shell_search_via_js(driver) -> bool:
     """
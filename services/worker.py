@@ -2,10 +2,19 @@
 from __future__ import annotations
 
 import logging
+import os
+from logging.handlers import QueueHandler
+import queue
+import random
+import re
 import threading
 import time
+from collections import deque
+from dataclasses import dataclass
 from functools import partial
-from typing import Dict, Any, List, Tuple
+from itertools import chain, islice
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Tuple
 
 from selenium.common.exceptions import (
     InvalidSessionIdException,
@@ -17,37 +26,305 @@ from selenium.common.exceptions import (
     ElementNotInteractableException,
 )
 
-from services.schemas import ExchangeRateItem
+from services.schemas import ExchangeRateItem, norm_status
 from services.driver import get_driver
 from services.auth import login
-from services.ui import wait_ui5_idle, wait_for_shell_home, wait_shell_search_ready, wait_url_contains
+from services.ui import wait_ui5_idle, wait_for_shell_home, wait_combined, wait_url_contains, wait_authenticated
 from pages.Shell.Search.element import ShellSearch
 from pages.CurrencyExchangeRates.page import CurrencyExchangeRatesPage
-from services.commit import commit_gate
-from services.tracking import mark_item_status, iter_pending_items
+from services.commit import commit_gate, use_shared_gate
+from services.tracking import TrackerWriter, iter_pending_items, count_pending
 
 log = logging.getLogger("sapbot")
 
+# ---- Result handlers: record one page.create_rate row in results + tracker ----
+# mark(idx, tracker_status, extra) is the worker's tracker writer.
+
+def _on_created(idx: int, row: Dict[str, Any], results: List[Dict[str, Any]], mark) -> None:
+    results.append(row)
+    mark(idx, "Done", {"notes": row.get("notes", {})})
+
+
+def _on_pending(idx: int, row: Dict[str, Any], results: List[Dict[str, Any]], mark) -> None:
+    results.append(row)
+    mark(idx, "Pending", {"notes": row.get("notes", {})})
+
+
+def _on_skipped(idx: int, row: Dict[str, Any], results: List[Dict[str, Any]], mark) -> None:
+    """Persist dialog_text (or error) for Skipped rows, both in results and tracking."""
+    if not row.get("dialog_text"):
+        if row.get("error"):
+            row["dialog_text"] = row["error"]
+    results.append(row)
+    mark(idx, "Skipped", {"notes": row.get("notes", {}), "dialog_text": row.get("dialog_text") or ""})
+
+
+def _on_error(idx: int, row: Dict[str, Any], results: List[Dict[str, Any]], mark) -> None:
+    results.append({**row, "status": "error"})
+    err = row.get("error")
+    mark(idx, "Error", {"error": err if isinstance(err, str) else (row.get("dialog_text") or "")})
+
+
+# Keyed by the raw status; the page emits lowercase, the other casings are cheap insurance.
+# Unknown values go through one normalized lookup and default to _on_error.
+_HANDLERS = {
+    "created": _on_created, "Created": _on_created,
+    "skipped": _on_skipped, "Skipped": _on_skipped,
+    "pending": _on_pending, "Pending": _on_pending,
+}
+
+
+_FATAL_RE = re.compile(
+    r"invalid session id"
+    r"|chrome not reachable"
+    r"|target closed"
+    r"|disconnected: not connected to devtools"
+    r"|cannot determine loading status",
+    re.I,
+)
+
+
+def _err_msg(err: BaseException) -> str:
+    """
+    Exception text without the screen/remote stacktrace that WebDriverException.__str__
+    appends (its .msg); other exceptions fall back to str().
+    """
+    msg = getattr(err, "msg", None)
+    return msg if isinstance(msg, str) else str(err)
+
 
 def _is_fatal_session_err(err: Exception) -> bool:
-    msg = (str(err) or "").lower()
     return (
         isinstance(err, (InvalidSessionIdException, NoSuchWindowException))
-        or any(s in msg for s in [
-            "invalid session id",
-            "chrome not reachable",
-            "target closed",
-            "disconnected: not connected to devtools",
-            "cannot determine loading status",
-        ])
+        or _FATAL_RE.search(_err_msg(err)) is not None
     )
 
 
+@dataclass(frozen=True)
+class Policy:
+    """How the item loop reacts to a driver exception."""
+    soft: bool   # try _soft_recover in the same driver first (up to NONFATAL_RETRIES)
+    fatal: bool  # session is gone: skip reattach, start a new driver
+    tag: str     # log tag
+
+
+_SOFT_DOM = Policy(soft=True, fatal=False, tag="soft-retry")
+_POLICY: Dict[type, Policy] = {
+    TimeoutException: Policy(soft=False, fatal=False, tag="driver-recreate"),
+    StaleElementReferenceException: _SOFT_DOM,
+    ElementClickInterceptedException: _SOFT_DOM,
+    ElementNotInteractableException: _SOFT_DOM,
+}
+_FATAL_WEBDRIVER = Policy(soft=False, fatal=True, tag="driver-exc")
+_NONFATAL_WEBDRIVER = Policy(soft=True, fatal=False, tag="driver-exc")
+
+
+def _policy_for(err: WebDriverException) -> Policy:
+    for cls in type(err).__mro__:
+        pol = _POLICY.get(cls)
+        if pol is not None:
+            return pol
+    return _FATAL_WEBDRIVER if _is_fatal_session_err(err) else _NONFATAL_WEBDRIVER
+
+
+def _pin_current_thread(worker_id: int):
+    """
+    Best-effort: pin the calling thread to one CPU (round-robin over the CPUs this process
+    may use). Returns a restore callable, or None when pinning isn't available.
+    Linux: sched_setaffinity(0) targets the calling thread. Windows: SetThreadAffinityMask.
+    """
+    if hasattr(os, "sched_setaffinity"):
+        try:
+            prev = os.sched_getaffinity(0)
+            cpus = sorted(prev)
+            os.sched_setaffinity(0, {cpus[worker_id % len(cpus)]})
+        except (OSError, ValueError, IndexError):
+            return None
+        return lambda: os.sched_setaffinity(0, prev)
+    if os.name == "nt":
+        try:
+            import ctypes
+            k32 = ctypes.windll.kernel32  # type: ignore[attr-defined]
+            cpu = worker_id % (os.cpu_count() or 1)
+            h = k32.GetCurrentThread()
+            prev_mask = k32.SetThreadAffinityMask(h, 1 << cpu)
+            if not prev_mask:
+                return None
+        except Exception:
+            return None
+        return lambda: k32.SetThreadAffinityMask(h, prev_mask)
+    return None
+
+
+class LoginSlots:
+    """
+    LOGIN_CONCURRENCY login slots, used like the semaphore it replaces (`with login_sem:`).
+    Each slot is an Event that is set while free; a waiter claims the first free one under a
+    short lock and otherwise sleep-polls every `poll` seconds instead of queueing in the
+    kernel, so a set `cancel` event (the runner's) ends the wait with RuntimeError.
+    """
+
+    def __init__(self, n: int, cancel: threading.Event | None = None, poll: float = 0.05):
+        self._slots = [threading.Event() for _ in range(max(1, int(n)))]
+        for ev in self._slots:
+            ev.set()
+        self._lock = threading.Lock()
+        self._held = threading.local()
+        self._cancel = cancel
+        self._poll = poll
+
+    def _claim(self) -> threading.Event | None:
+        with self._lock:
+            for ev in self._slots:
+                if ev.is_set():
+                    ev.clear()
+                    return ev
+        return None
+
+    def acquire(self) -> bool:
+        while True:
+            ev = self._claim()
+            if ev is not None:
+                self._held.slot = ev
+                return True
+            if self._cancel is None:
+                time.sleep(self._poll)
+            elif self._cancel.wait(self._poll):
+                raise RuntimeError("login cancelled")
+
+    def release(self) -> None:
+        ev = getattr(self._held, "slot", None)
+        if ev is None:
+            raise RuntimeError("release of an unheld login slot")
+        self._held.slot = None
+        ev.set()
+
+    def __enter__(self) -> "LoginSlots":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+# Cookie jars from recent successful logins, shared by all workers. A recreated driver
+# tries one before queueing on login_sem; deque ops are atomic, so no lock is needed.
+_LOGIN_TOKENS: deque = deque(maxlen=8)
+
+
+def _offer_login_token(drv) -> None:
+    try:
+        cookies = drv.get_cookies()
+    except Exception:
+        return
+    if cookies:
+        _LOGIN_TOKENS.append({"cookies": cookies, "ts": time.monotonic()})
+
+
+def _login_with_token(drv, root_url: str, ttl_sec: int) -> bool:
+    """
+    Load a pooled cookie jar into a fresh driver and check that the session is really
+    authenticated (launchpad container up, no logon form). A working token goes back to
+    the pool; expired or rejected ones are dropped.
+    """
+    now = time.monotonic()
+    while True:
+        try:
+            tok = _LOGIN_TOKENS.popleft()
+        except IndexError:
+            return False
+        if now - tok["ts"] <= ttl_sec:
+            break
+    try:
+        drv.get(root_url)  # cookies can only be set for the current domain
+        for c in tok["cookies"]:
+            try:
+                drv.add_cookie(c)
+            except Exception:
+                pass
+        drv.get(root_url)
+        ok = wait_authenticated(drv, timeout=15)
+    except Exception:
+        ok = False
+    if ok:
+        _LOGIN_TOKENS.append(tok)
+    return ok
+
+
+class DriverPool:
+    """
+    Pre-warmed, logged-in drivers for the recovery path (DRIVER_POOL_MIN_IDLE > 0).
+    A daemon thread keeps `min_idle` idle sessions ready (logging in under the shared
+    login_sem); a worker that has to replace its driver takes one instead of paying for
+    Chrome start-up + login. Round-scoped: the runner closes it before profiles are cleaned.
+    """
+
+    def __init__(self, cfg: Dict[str, Any], login_sem, min_idle: int):
+        self.cfg = cfg
+        self.login_sem = login_sem
+        self.min_idle = max(1, int(min_idle))
+        self._idle: deque = deque()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._fill, name="sapbot-prewarm", daemon=True)
+
+    def start(self) -> "DriverPool":
+        self._thread.start()
+        return self
+
+    def _fill(self) -> None:
+        while not self._stop.is_set():
+            if len(self._idle) >= self.min_idle:
+                self._stop.wait(0.5)
+                continue
+            drv = None
+            try:
+                drv = get_driver(headless=self.cfg["HEADLESS"])
+                with self.login_sem:
+                    login(drv)
+                wait_ui5_idle(drv, timeout=30)
+            except Exception as e:
+                log.warning("[pool] prewarm failed: %s: %s", type(e).__name__, e)
+                _quit_quietly(drv)
+                self._stop.wait(5.0)
+                continue
+            if self._stop.is_set():
+                _quit_quietly(drv)
+                break
+            self._idle.append(drv)
+
+    def take(self):
+        """An idle driver whose session still answers, or None when the pool is empty."""
+        while True:
+            try:
+                drv = self._idle.popleft()
+            except IndexError:
+                return None
+            try:
+                drv.current_url  # cheap round-trip: is the session still alive?
+                return drv
+            except Exception:
+                _quit_quietly(drv)
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=60)
+        while self._idle:
+            _quit_quietly(self._idle.popleft())
+
+
+def _quit_quietly(drv) -> None:
+    try:
+        if drv is not None:
+            drv.quit()
+    except Exception:
+        pass
+
+
 def _open_currency_app(drv) -> CurrencyExchangeRatesPage:
     if not wait_for_shell_home(drv, timeout=60):
         raise RuntimeError("Shell home not detected after login")
-    wait_ui5_idle(drv, timeout=30)
-    wait_shell_search_ready(drv, timeout=30)
+    # one probe per tick for both conditions
+    wait_combined(drv, needs=("ui5_idle", "search_ready"), timeout=30)
 
     from selenium.common.exceptions import StaleElementReferenceException
     from services.ui import open_shell_search_via_js
@@ -91,17 +368,144 @@ def _open_currency_app(drv) -> CurrencyExchangeRatesPage:
     return page
 
 
-def chunk_evenly(indexed: List[Tuple[int, ExchangeRateItem]], workers: int) -> List[List[Tuple[int, ExchangeRateItem]]]:
-    n = max(1, min(workers, len(indexed))) if indexed else 1
-    k, m = divmod(len(indexed), n)
-    chunks: List[List[Tuple[int, ExchangeRateItem]]] = []
+def chunk_evenly(n_items: int, workers: int) -> List[Tuple[int, int]]:
+    """
+    Split range(n_items) into up to `workers` contiguous (start, end) bounds.
+    These are the tracker shards (one driver-<id>.json each); workers themselves
+    pull rows from a shared WorkQueue rather than owning a shard.
+    """
+    n = max(1, min(workers, n_items)) if n_items else 1
+    k, m = divmod(n_items, n)
+    bounds: List[Tuple[int, int]] = []
     start = 0
     for i in range(n):
         end = start + k + (1 if i < m else 0)
         if start < end:
-            chunks.append(indexed[start:end])
+            bounds.append((start, end))
         start = end
-    return chunks
+    return bounds
+
+
+class WorkQueue:
+    """
+    Shared queue of (index, item, tracker) for one round. Workers pull a few entries
+    at a time when free instead of owning a fixed shard, so slow items (retries,
+    re-logins) no longer pin the round's tail to one worker.
+    Entries are drawn lazily from `entries`; `total` is the expected count, used for
+    sizing only (len() is what is left of it).
+    """
+
+    def __init__(self, entries: Iterable[Tuple[int, ExchangeRateItem, TrackerWriter]], total: int, batch: int = 4):
+        self._src = iter(entries)
+        self._left = max(0, int(total))
+        self._lock = threading.Lock()
+        self.batch = max(1, int(batch))
+
+    def __len__(self) -> int:
+        return self._left
+
+    def get_batch(self) -> List[Tuple[int, ExchangeRateItem, TrackerWriter]]:
+        """Up to `batch` entries under one lock acquire; [] once drained."""
+        with self._lock:
+            chunk = list(islice(self._src, self.batch))
+            self._left = max(0, self._left - len(chunk)) if chunk else 0
+            return chunk
+
+    def __iter__(self) -> Iterator[Tuple[int, ExchangeRateItem, TrackerWriter]]:
+        while True:
+            chunk = self.get_batch()
+            if not chunk:
+                return
+            yield from chunk
+
+
+def build_work_queue(track_files: Iterable[Path], cfg: Dict[str, Any]) -> Tuple[WorkQueue, List[TrackerWriter]]:
+    """
+    Queue every Pending row of the given trackers (rows in other states are never
+    re-run), streamed tracker by tracker in index order. Returns the queue and the
+    per-file writers; the caller closes the writers once all workers are done.
+    """
+    writers: List[TrackerWriter] = []
+    sources = []
+    total = 0
+    for tf in track_files:
+        n = count_pending(tf)
+        if not n:
+            continue
+        w = TrackerWriter(
+            tf,
+            flush_every=int(cfg.get("TRACK_FLUSH_EVERY", 16)),
+            flush_ms=int(cfg.get("TRACK_FLUSH_MS", 2000)),
+        )
+        writers.append(w)
+        sources.append(_tracker_entries(tf, w))
+        total += n
+    return WorkQueue(chain.from_iterable(sources), total, batch=int(cfg.get("WORK_QUEUE_BATCH", 4))), writers
+
+
+def _tracker_entries(tf: Path, w: TrackerWriter) -> Iterator[Tuple[int, ExchangeRateItem, TrackerWriter]]:
+    for idx, it in iter_pending_items(tf, w):
+        yield idx, it, w
+
+
+def close_writers(writers: Iterable[TrackerWriter]) -> None:
+    for w in writers:
+        try:
+            w.close()
+        except Exception as e:
+            log.error("[tracker] close failed for %s: %s: %s", w.path, type(e).__name__, e)
+
+
+def process_worker_main(
+    track_files: List[Path],
+    stop_event,
+    login_sem,
+    cfg: Dict[str, Any],
+    worker_id: int,
+    result_q,
+    commit_shared: tuple,
+    log_q,
+) -> None:
+    """
+    Entry point of a worker *process* (WORKER_PROCESSES mode). The process owns whole
+    tracker shards: it builds its own queue and writers over `track_files`, runs
+    worker_process and puts (worker_id, result) on `result_q`. stop_event/login_sem are
+    the multiprocessing counterparts of the threading primitives (same API).
+    `commit_shared` (services.commit.make_shared_gate) keeps COMMIT_CONCURRENCY and the
+    per-key commit serialization batch-wide; sapbot records go to the parent via `log_q`.
+    """
+    # a spawned child starts with an unconfigured sapbot logger: forward to the parent's
+    log.handlers[:] = [QueueHandler(log_q)]
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    use_shared_gate(commit_shared)
+
+    work_q, writers = build_work_queue(track_files, cfg)
+    try:
+        r = worker_process(work_q, stop_event, login_sem, cfg, worker_id)
+    except Exception as e:
+        r = {"results": [{
+            "index": None,
+            "status": "error",
+            "error": f"worker_crashed: {type(e).__name__}: {e}",
+        }]}
+    finally:
+        close_writers(writers)
+    result_q.put((worker_id, r))
+
+
+class _QueueSink:
+    """list.append stand-in for worker_process(result_q=...): forwards rows, keeps a count."""
+
+    __slots__ = ("_put", "count")
+
+    def __init__(self, q):
+        self._put = q.put
+        self.count = 0
+
+    def append(self, row: Dict[str, Any]) -> None:
+        self._put(row)
+        self.count += 1
 
 
 def _commit_key_for_item(it: ExchangeRateItem, strategy: str) -> str | None:
@@ -133,27 +537,35 @@ def _commit_key_for_item(it: ExchangeRateItem, strategy: str) -> str | None:
 
 
 def worker_process(
-    shard: List[Tuple[int, ExchangeRateItem]],
+    work_q: WorkQueue,
     stop_event: threading.Event,
     login_sem: threading.Semaphore,
     cfg: Dict[str, Any],
     worker_id: int,
-    track_file_path,  # Path
+    driver_pool: DriverPool | None = None,
+    result_q: queue.Queue | None = None,
+    cancel_event: threading.Event | None = None,
 ) -> Dict[str, Any]:
     """
-    Per-thread worker. Own Chrome session.
-    Uses per-worker tracking file to persist progress. Status values:
+    Per-thread worker. Own Chrome session (taken from `driver_pool` when one is given).
+    Pulls (index, item, tracker) entries from the shared work queue until it is drained;
+    row index is the 1-based position in the batch. Progress goes to the tracker of the
+    shard the row belongs to. Status values:
       - Pending  → not finished, will be retried
       - Done     → created (success)
       - Skipped  → duplicate existed (policy)
       - Error    → terminal error for this batch
 
-    **IMPORTANT CHANGE**
-    If a tracker file exists, we will ONLY process rows still marked Pending.
-    If there are no Pending rows in the tracker, we return immediately with no work.
-    We DO NOT fall back to the original shard in that case.
+    The queue only holds rows still marked Pending (see build_work_queue).
+    If it is already empty, we return immediately without opening a browser.
+
+    With `result_q`, each result row is put on it as soon as it is known and the return
+    value only carries the row count; otherwise rows are collected and returned together.
+
+    Once `cancel_event` is set the worker finishes the row in hand and stops; rows not yet
+    taken stay Pending in their tracker.
     """
-    results: List[Dict[str, Any]] = []
+    results = _QueueSink(result_q) if result_q is not None else []
     drv = None
     page = None
 
@@ -162,37 +574,101 @@ def worker_process(
     WATCHDOG_SECONDS = int(cfg.get("WATCHDOG_SECONDS", 2000))
     MAX_OPEN_RETRIES = 3
     NONFATAL_RETRIES = 2  # soft retries inside SAME driver for flaky DOM
+    RECOVER_BUDGET_SEC = float(cfg.get("RECOVER_BUDGET_SEC", 120))  # whole app-reopen loop
+    root_url = cfg.get("ROOT_URL") or cfg.get("SAP_URL")
+    token_reuse = bool(cfg.get("LOGIN_TOKEN_REUSE", False)) and bool(root_url)
+    token_ttl = int(cfg.get("LOGIN_TOKEN_TTL_SEC", 900))
 
-    # ---- Build the todo queue ----
-    # If the tracker file exists, ALWAYS respect it and only take Pending rows.
-    # If it doesn't exist (should not happen after init), fall back to the shard (first run).
-    if track_file_path and track_file_path.exists():
-        pending_list = iter_pending_items(track_file_path)
-        # CRITICAL: do not "re-expand" the shard when nothing is pending; just exit with no work.
-        if not pending_list:
-            return {"interrupted": False, "results": []}
-    else:
-        pending_list = shard[:]
+    if not len(work_q):
+        return {"interrupted": False, "results": []}
+
+    # writer of the row being processed (rebound per entry) + every writer touched so far
+    tracker: TrackerWriter | None = None
+    touched: set = set()
+
+    def _mark(idx: int, status: str, extra: Dict[str, Any] | None = None):
+        if tracker is not None:
+            tracker.update(idx, status, extra)
+
+    def _flush_tracker():
+        """Persist buffered statuses now (before a driver teardown or on stop)."""
+        for w in list(touched):
+            try:
+                w.flush()
+            except Exception as e:
+                log.error("[tracker] worker=%s flush failed: %s: %s", worker_id, type(e).__name__, e)
 
     def _kill_driver():
         nonlocal drv
-        try:
-            if drv:
-                drv.quit()
-        except Exception:
-            pass
+        _quit_quietly(drv)
         drv = None
 
-    def _recreate_driver_and_reopen(max_open_retries: int = MAX_OPEN_RETRIES):
-        nonlocal drv, page
+    def _soft_reattach():
+        """
+        Browser still alive: keep the session (and its login cookies), navigate home and
+        reopen the app. Returns the page, or None if the session turns out to be unusable.
+        """
+        if drv is None or not root_url:
+            return None
+        try:
+            drv.get(root_url)
+            page_local = _open_currency_app(drv)
+            log.info("[reattach] worker=%s reopened app in existing session", worker_id)
+            return page_local
+        except Exception as e:
+            log.warning("[reattach] worker=%s failed: %s: %s → hard recreate", worker_id, type(e).__name__, e)
+            return None
+
+    def _recreate_driver_and_reopen(max_open_retries: int = MAX_OPEN_RETRIES, fatal: bool = True):
+        """Non-fatal errors try _soft_reattach first; fatal ones (or a failed reattach) start over."""
+        if not fatal:
+            _flush_tracker()
+            page_local = _soft_reattach()
+            if page_local is not None:
+                return page_local
+        return _hard_recreate(max_open_retries)
+
+    def _hard_recreate(max_open_retries: int = MAX_OPEN_RETRIES):
+        nonlocal drv
         log.warning("[reopen] worker=%s recreating driver (max_open_retries=%s)", worker_id, max_open_retries)
+        # one monotonic budget for driver start + login + every app-open attempt
+        budget_end = time.monotonic() + RECOVER_BUDGET_SEC
+        _flush_tracker()
         _kill_driver()
-        drv = get_driver(headless=cfg["HEADLESS"])
-        with login_sem:
-            login(drv)
+        drv = driver_pool.take() if driver_pool is not None else None
+        if drv is not None:
+            # already logged in by the prewarm thread
+            log.info("[reopen] worker=%s took a pre-warmed driver from the pool", worker_id)
+            if token_reuse:
+                _offer_login_token(drv)
+        else:
+            if unpin is not None and os.name != "nt":
+                # Chrome/chromedriver inherit the spawning thread's mask on Linux: launch unpinned
+                unpin()
+                try:
+                    drv = get_driver(headless=cfg["HEADLESS"])
+                finally:
+                    _pin_current_thread(worker_id)
+            else:
+                drv = get_driver(headless=cfg["HEADLESS"])
+            if token_reuse and _login_with_token(drv, root_url, token_ttl):
+                log.info("[reopen] worker=%s reused pooled login session", worker_id)
+            else:
+                with login_sem:
+                    login(drv)
+                if token_reuse:
+                    _offer_login_token(drv)
         wait_ui5_idle(drv, timeout=30)
+        # jittered exponential backoff between attempts; no attempt starts past the budget
+        delay = 0.2
         last_exc = None
-        for attempt in range(1, max_open_retries + 1):
+        attempt = 0
+        while attempt < max_open_retries:
+            if time.monotonic() >= budget_end:
+                log.error("[reopen] worker=%s recover budget of %ss exhausted after %s attempts",
+                          worker_id, RECOVER_BUDGET_SEC, attempt)
+                break
+            attempt += 1
             try:
                 page_local = _open_currency_app(drv)
                 log.info("[reopen] worker=%s reopened app on attempt=%s", worker_id, attempt)
@@ -200,238 +676,152 @@ def worker_process(
             except Exception as e:
                 last_exc = e
                 log.error("[reopen] worker=%s attempt=%s failed: %s: %s", worker_id, attempt, type(e).__name__, e)
-                time.sleep(1.0 * attempt)
-        raise RuntimeError(f"open_app_failed after {max_open_retries} attempts: {last_exc}")
+            if attempt == max_open_retries:
+                break
+            pause = delay + random.uniform(0, delay)
+            if time.monotonic() + pause >= budget_end:
+                break
+            time.sleep(pause)
+            delay = min(delay * 2, 1.0)
+        if last_exc is None:
+            raise RuntimeError(f"open_app_failed: recover budget of {RECOVER_BUDGET_SEC}s spent before the first attempt")
+        raise RuntimeError(f"open_app_failed after {attempt} attempts: {_err_msg(last_exc)}")
+
+    def _build_row(idx: int, payload: Dict[str, Any], res: Dict[str, Any]) -> Dict[str, Any]:
+        return {"index": idx, "payload": payload, **res, "worker": worker_id}
+
+    def _dispatch(idx: int, row: Dict[str, Any]):
+        raw = row.get("status")
+        handler = _HANDLERS.get(raw) or _HANDLERS.get(norm_status(raw), _on_error)
+        handler(idx, row, results, _mark)
+
+    def _recover_and_retry(idx: int, payload: Dict[str, Any], do_one, fatal: bool = False):
+        """Reattach/recreate the driver, reopen the app and run the item once more; failure → Error row."""
+        nonlocal page
+        try:
+            page = _recreate_driver_and_reopen(max_open_retries=2, fatal=fatal)
+            _dispatch(idx, _build_row(idx, payload, do_one()))
+        except Exception as e2:
+            if cancel_event is not None and cancel_event.is_set():
+                # batch cancelled mid-recovery (e.g. a queued login gave up): not the row's fault
+                _on_pending(idx, {"index": idx, "payload": payload, "status": "pending", "worker": worker_id},
+                            results, _mark)
+                return
+            row = {
+                "index": idx, "payload": payload, "status": "error",
+                "error": f"recover_failed(w{worker_id}): {type(e2).__name__}: {_err_msg(e2)}",
+                "worker": worker_id,
+            }
+            results.append(row)
+            _mark(idx, "Error", {"error": row["error"]})
+
+    def _soft_recover():
+        """Non-fatal DOM hiccup: re-anchor inside the same driver."""
+        try:
+            page.ensure_in_app_quick()
+        except Exception:
+            try:
+                page.ensure_in_app(max_attempts=2, settle_each=8)
+            except Exception:
+                pass
+        time.sleep(0.3)
+
+    # One watchdog per worker: _do_one arms a monotonic deadline, the thread polls it.
+    deadline = [0.0]
+    watch_idx: List[Any] = [None]
+    wd_stop = threading.Event()
+
+    def _watchdog_loop():
+        while not wd_stop.wait(1.0):
+            dl = deadline[0]
+            if dl and time.monotonic() > dl:
+                deadline[0] = 0.0
+                log.critical("[watchdog] worker=%s idx=%s exceeded=%ss → killing driver",
+                             worker_id, watch_idx[0], WATCHDOG_SECONDS)
+                _kill_driver()
 
-    def _track_skipped(idx: int, row: Dict[str, Any]):
-        """
-        Ensure dialog_text (or error) is persisted for Skipped rows, both in results and tracking.
-        """
-        # normalize & keep dialog_text in results
-        if not row.get("dialog_text"):
-            if row.get("error"):
-                row["dialog_text"] = row["error"]
-        results.append(row)
-        if track_file_path:
-            mark_item_status(
-                track_file_path,
-                idx,
-                "Skipped",
-                {
-                    "notes": row.get("notes", {}),
-                    "dialog_text": row.get("dialog_text") or "",
-                },
-            )
+    wd_thread = threading.Thread(target=_watchdog_loop, name=f"watchdog-w{worker_id}", daemon=True)
+    wd_thread.start()
+
+    # pool threads are reused across rounds: the original mask is restored in finally
+    unpin = _pin_current_thread(worker_id) if cfg.get("WORKER_CPU_AFFINITY") else None
 
     try:
         try:
-            page = _recreate_driver_and_reopen()
+            page = _hard_recreate()
         except Exception as e:
             # Could not open a browser/app now. Leave rows Pending so the runner requeues.
             log.error("[init-failed] worker=%s could not open driver/app: %s: %s",
                       worker_id, type(e).__name__, e)
             return {"interrupted": False, "results": []}
 
-        for idx, it in pending_list:
+        for idx, it, tracker in work_q:
+            if cancel_event is not None and cancel_event.is_set():
+                log.warning("[cancel] worker=%s stopping; remaining rows stay Pending", worker_id)
+                break
+            touched.add(tracker)
             commit_key = _commit_key_for_item(it, key_strategy)
             if stop_event.is_set():
+                _flush_tracker()
                 stop_event.clear()
 
-            def _watchdog_kill():
-                log.critical("[watchdog] worker=%s idx=%s exceeded=%ss → killing driver", worker_id, idx, WATCHDOG_SECONDS)
-                _kill_driver()
+            # once per item, not per attempt/branch: row payload + create_rate arguments
+            payload = it.dict()
+            rate_kwargs = dict(
+                exch_type=it.ExchangeRateType,
+                from_ccy=it.FromCurrency,
+                to_ccy=it.ToCurrency,
+                valid_from_mmddyyyy=it.ValidFrom,
+                quotation=it.Quotation,
+                rate_value=it.ExchangeRate,
+                commit_gate=(partial(commit_gate, key=commit_key) if commit_key is not None else commit_gate),
+            )
 
             def _do_one():
-                timer = threading.Timer(WATCHDOG_SECONDS, _watchdog_kill)
-                timer.daemon = True
-                timer.start()
+                watch_idx[0] = idx
+                deadline[0] = time.monotonic() + WATCHDOG_SECONDS
                 try:
-                    return page.create_rate(
-                        exch_type=it.ExchangeRateType,
-                        from_ccy=it.FromCurrency,
-                        to_ccy=it.ToCurrency,
-                        valid_from_mmddyyyy=it.ValidFrom,
-                        quotation=it.Quotation,
-                        rate_value=it.ExchangeRate,
-                        commit_gate=(partial(commit_gate, key=commit_key) if commit_key is not None else commit_gate),
-                    )
+                    return page.create_rate(**rate_kwargs)
                 finally:
-                    try:
-                        timer.cancel()
-                    except Exception:
-                        pass
+                    deadline[0] = 0.0
 
             soft_attempt = 0
             while True:
                 try:
-                    res = _do_one()
-                    row = {"index": idx, "payload": it.dict(), **res, "worker": worker_id}
-                    # normalize status coming from page
-                    st = (row.get("status") or "").strip().lower()
-                    if st == "created":
-                        results.append(row)
-                        if track_file_path:
-                            mark_item_status(track_file_path, idx, "Done", {"notes": row.get("notes", {})})
-                    elif st == "skipped":
-                        _track_skipped(idx, row)
-                    elif st == "pending":
-                        results.append(row)
-                        if track_file_path:
-                            mark_item_status(track_file_path, idx, "Pending", {"notes": row.get("notes", {})})
-                    else:
-                        results.append({**row, "status": "error"})
-                        if track_file_path:
-                            mark_item_status(
-                                track_file_path, idx, "Error",
-                                {"error": row.get("error") if isinstance(row.get("error"), str) else (row.get("dialog_text") or "")}
-                            )
-                    time.sleep(0.2)
-                    break
-
-                except TimeoutException as e:
-                    log.error("[driver-recreate] worker=%s idx=%s cause=TimeoutException msg=%r", worker_id, idx, str(e))
-                    try:
-                        page = _recreate_driver_and_reopen(max_open_retries=2)
-                        res = _do_one()
-                        row = {"index": idx, "payload": it.dict(), **res, "worker": worker_id}
-                        st = (row.get("status") or "").strip().lower()
-                        if st == "created":
-                            results.append(row); mark_item_status(track_file_path, idx, "Done", {"notes": row.get("notes", {})})
-                        elif st == "skipped":
-                            _track_skipped(idx, row)
-                        elif st == "pending":
-                            results.append(row); mark_item_status(track_file_path, idx, "Pending", {"notes": row.get("notes", {})})
-                        else:
-                            results.append({**row, "status": "error"}); mark_item_status(track_file_path, idx, "Error",
-                                                                                          {"error": row.get("error") or row.get("dialog_text") or ""})
-                    except Exception as e2:
-                        row = {
-                            "index": idx, "payload": it.dict(), "status": "error",
-                            "error": f"recover_failed(w{worker_id}): {type(e2).__name__}: {e2}",
-                            "worker": worker_id,
-                        }
-                        results.append(row)
-                        if track_file_path:
-                            mark_item_status(track_file_path, idx, "Error", {"error": row["error"]})
+                    _dispatch(idx, _build_row(idx, payload, _do_one()))
+                    page.wait_ready(timeout=0.2, poll=0.02)
                     break
 
-                except (StaleElementReferenceException, ElementClickInterceptedException, ElementNotInteractableException) as e:
-                    if soft_attempt < NONFATAL_RETRIES:
+                except WebDriverException as e:
+                    pol = _policy_for(e)
+                    if pol.soft and soft_attempt < NONFATAL_RETRIES:
                         soft_attempt += 1
-                        log.warning("[soft-retry] worker=%s idx=%s attempt=%s cls=%s msg=%r",
-                                    worker_id, idx, soft_attempt, type(e).__name__, str(e))
-                        try:
-                            page.ensure_in_app_quick()
-                        except Exception:
-                            try:
-                                page.ensure_in_app(max_attempts=2, settle_each=8)
-                            except Exception:
-                                pass
-                        time.sleep(0.3)
+                        log.warning("[soft-retry] worker=%s idx=%s attempt=%s tag=%s cls=%s msg=%r",
+                                    worker_id, idx, soft_attempt, pol.tag, type(e).__name__, _err_msg(e))
+                        _soft_recover()
                         continue
-                    else:
-                        log.error("[soft-retry-exhausted] worker=%s idx=%s cls=%s → recreating driver",
-                                  worker_id, idx, type(e).__name__)
-                        try:
-                            page = _recreate_driver_and_reopen(max_open_retries=2)
-                            res = _do_one()
-                            row = {"index": idx, "payload": it.dict(), **res, "worker": worker_id}
-                            st = (row.get("status") or "").strip().lower()
-                            if st == "created":
-                                results.append(row); mark_item_status(track_file_path, idx, "Done", {"notes": row.get("notes", {})})
-                            elif st == "skipped":
-                                _track_skipped(idx, row)
-                            elif st == "pending":
-                                results.append(row); mark_item_status(track_file_path, idx, "Pending", {"notes": row.get("notes", {})})
-                            else:
-                                results.append({**row, "status": "error"}); mark_item_status(track_file_path, idx, "Error",
-                                                                                              {"error": row.get("error") or row.get("dialog_text") or ""})
-                        except Exception as e2:
-                            row = {
-                                "index": idx, "payload": it.dict(), "status": "error",
-                                "error": f"recover_failed(w{worker_id}): {type(e2).__name__}: {e2}",
-                                "worker": worker_id,
-                            }
-                            results.append(row)
-                            if track_file_path:
-                                mark_item_status(track_file_path, idx, "Error", {"error": row["error"]})
-                        break
-
-                except WebDriverException as e:
-                    fatal = _is_fatal_session_err(e)
-                    log.error("[driver-exc] worker=%s idx=%s fatal=%s cls=%s msg=%r",
-                              worker_id, idx, fatal, type(e).__name__, str(e))
-                    if fatal:
-                        try:
-                            page = _recreate_driver_and_reopen(max_open_retries=2)
-                            res = _do_one()
-                            row = {"index": idx, "payload": it.dict(), **res, "worker": worker_id}
-                            st = (row.get("status") or "").strip().lower()
-                            if st == "created":
-                                results.append(row); mark_item_status(track_file_path, idx, "Done", {"notes": row.get("notes", {})})
-                            elif st == "skipped":
-                                _track_skipped(idx, row)
-                            elif st == "pending":
-                                results.append(row); mark_item_status(track_file_path, idx, "Pending", {"notes": row.get("notes", {})})
-                            else:
-                                results.append({**row, "status": "error"}); mark_item_status(track_file_path, idx, "Error",
-                                                                                              {"error": row.get("error") or row.get("dialog_text") or ""})
-                        except Exception as e2:
-                            row = {
-                                "index": idx, "payload": it.dict(), "status": "error",
-                                "error": f"recover_failed(w{worker_id}): {type(e2).__name__}: {e2}",
-                                "worker": worker_id,
-                            }
-                            results.append(row)
-                            if track_file_path:
-                                mark_item_status(track_file_path, idx, "Error", {"error": row["error"]})
-                    else:
-                        if soft_attempt < NONFATAL_RETRIES:
-                            soft_attempt += 1
-                            log.warning("[soft-retry] worker=%s idx=%s attempt=%s nonfatal-webdriver cls=%s msg=%r",
-                                        worker_id, idx, soft_attempt, type(e).__name__, str(e))
-                            try:
-                                page.ensure_in_app_quick()
-                            except Exception:
-                                try:
-                                    page.ensure_in_app(max_attempts=2, settle_each=8)
-                                except Exception:
-                                    pass
-                            time.sleep(0.3)
-                            continue
-                        else:
-                            log.error("[soft-retry-exhausted] worker=%s idx=%s nonfatal-webdriver → recreating driver",
-                                      worker_id, idx)
-                            try:
-                                page = _recreate_driver_and_reopen(max_open_retries=2)
-                                res = _do_one()
-                                row = {"index": idx, "payload": it.dict(), **res, "worker": worker_id}
-                                st = (row.get("status") or "").strip().lower()
-                                if st == "created":
-                                    results.append(row); mark_item_status(track_file_path, idx, "Done", {"notes": row.get("notes", {})})
-                                elif st == "skipped":
-                                    _track_skipped(idx, row)
-                                elif st == "pending":
-                                    results.append(row); mark_item_status(track_file_path, idx, "Pending", {"notes": row.get("notes", {})})
-                                else:
-                                    results.append({**row, "status": "error"}); mark_item_status(track_file_path, idx, "Error",
-                                                                                                {"error": row.get("error") or row.get("dialog_text") or ""})
-                            except Exception as e2:
-                                row = {
-                                    "index": idx, "payload": it.dict(), "status": "error",
-                                    "error": f"recover_failed(w{worker_id}): {type(e2).__name__}: {e2}",
-                                    "worker": worker_id,
-                                }
-                                results.append(row)
-                                if track_file_path:
-                                    mark_item_status(track_file_path, idx, "Error", {"error": row["error"]})
+                    log.error("[%s] worker=%s idx=%s fatal=%s cls=%s msg=%r → recreating driver",
+                              "soft-retry-exhausted" if pol.soft else pol.tag,
+                              worker_id, idx, pol.fatal, type(e).__name__, _err_msg(e))
+                    _recover_and_retry(idx, payload, _do_one, fatal=pol.fatal)
                     break
 
     finally:
+        wd_stop.set()
+        wd_thread.join(timeout=2.0)
         try:
             if drv:
                 drv.quit()
         except Exception:
             pass
+        # writers are shared across workers; the runner closes (compacts) them after the round
+        _flush_tracker()
+        if unpin is not None:
+            try:
+                unpin()
+            except Exception:
+                pass
 
+    if result_q is not None:
+        return {"interrupted": False, "count": results.count}
     return {"interrupted": False, "results": results}
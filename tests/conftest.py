@@ -0,0 +1,6 @@
+# tests/conftest.py
+import sys
+from pathlib import Path
+
+# tests import the app packages (services, pages, core) from the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
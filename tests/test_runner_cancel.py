@@ -0,0 +1,54 @@
+# tests/test_runner_cancel.py
+import json
+import shutil
+import time
+import types
+
+import pytest
+
+pytest.importorskip("selenium")
+pytest.importorskip("pydantic")
+pytest.importorskip("dotenv")
+
+
+def _fake_worker(work_q, stop_event, login_sem, cfg, worker_id,
+                 driver_pool=None, result_q=None, cancel_event=None):
+    """Stands in for worker_process without a browser: same queue/tracker/cancel contract."""
+    n = 0
+    for idx, it, tracker in work_q:
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        time.sleep(0.01)
+        tracker.update(idx, "Done")
+        result_q.put({"index": idx, "payload": it.dict(), "status": "created", "worker": worker_id})
+        n += 1
+    return {"interrupted": False, "count": n}
+
+
+def test_closing_stream_leaves_unprocessed_rows_pending(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRACK_DIR", str(tmp_path / "track"))
+    from services import runner
+    from services.schemas import ExchangeRateItem
+    from services.tracking import read_live_status_summary
+
+    monkeypatch.setattr(runner, "worker_process", _fake_worker)
+    # keep the tracker dir the runner deletes on exit, to inspect it
+    monkeypatch.setattr(runner, "shutil", types.SimpleNamespace(rmtree=lambda *a, **k: None, move=shutil.move))
+
+    items = [
+        ExchangeRateItem(ExchangeRateType="M", FromCurrency=f"C{i:02d}", ToCurrency="USD",
+                         ValidFrom="01.01.2025", ExchangeRate="1.5")
+        for i in range(40)
+    ]
+    cfg = {"LOGIN_CONCURRENCY": 1, "TRACK_FLUSH_MS": 0, "TRACK_FLUSH_EVERY": 1}
+    br = runner.BatchRunner(cfg=cfg, batch_id="cancel-test", reports_root=tmp_path / "reports", workers=2)
+
+    gen = br.stream_events(items, heartbeat_sec=1)
+    for line in gen:
+        if json.loads(line)["event"] == "row":
+            break
+    gen.close()
+
+    totals = read_live_status_summary(track_dir=br.track_dir)["totals"]
+    assert totals["Pending"] > 0
+    assert totals["Done"] + totals["Pending"] == len(items)